@@ -4,14 +4,20 @@ import time
 import random
 from pympler import asizeof
 import matplotlib.pyplot as plt
-import pandas as pd
 
 from data_structures import Array_BKTree
 from data_structures import Linked_BKTree
+from data_structures import Columnar_BKTree
+from data_structures import Trie
+from data_structures import Length_Partitioned_Index
+from data_structures import SymSpell_Index
+from data_structures import QGram_Index
+from data_structures import LAESA_Index
 from Levenshtein import distance as levenshtein_distance
 
 from data_structures import *
 from utils import *
+from corpus import Corpus
 
 def hashmap_approx(word_map, word, tol):
     """
@@ -34,28 +40,43 @@ def hashmap_approx(word_map, word, tol):
    
     return ranked_airlines
 
-def test_search_time_against_tolerance(df, lower, higher, search_word):
+def test_search_time_against_tolerance(corpus, lower, higher, search_word):
     """
-    For the dataframe, plot the time performance for varying edit distance tolerance between lower (inclusive) to higher (exclusive)
+    For the corpus, plot the time performance for varying edit distance tolerance between lower (inclusive) to higher (exclusive)
     """
 
     linear_search_times = []
     array_search_times = []
     linked_search_times = []
+    trie_search_times = []
+    columnar_search_times = []
+    length_bk_search_times = []
+    symspell_search_times = []
+    qgram_search_times = []
+    laesa_search_times = []
     tols = [i for i in range(lower, higher)]
     # build trees from the first n words (building time is not included in retrieval timing)
     array_tree = Array_BKTree.Array_BKTree(MAXN, MAX_DIST)
     linked_tree = Linked_BKTree.Linked_BKTree()
+    columnar_tree = Columnar_BKTree.Columnar_BKTree()
+    length_bk_index = Length_Partitioned_Index.Length_Partitioned_Index()
+    symspell_index = SymSpell_Index.SymSpell_Index(SYMSPELL_MAX_TOL)
+    qgram_index = QGram_Index.QGram_Index(QGRAM_Q)
+    laesa_index = LAESA_Index.LAESA_Index(LAESA_NUM_PIVOTS)
+    trie = Trie.Trie()
     word_map = defaultdict(lambda: defaultdict(int))
 
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            array_tree.add(token, airline)
-            linked_tree.add(token, airline)
-            word_map[token][airline] += 1
+    pairs = list(corpus.iter_token_pairs())
+    array_tree.build_from(pairs)
+    linked_tree.build_from(pairs)
+    columnar_tree.build_from(pairs)
+    length_bk_index.build_from(pairs)
+    symspell_index.build_from(pairs)
+    qgram_index.build_from(pairs)
+    laesa_index.build_from(pairs)
+    for token, airline in pairs:
+        trie.insert(token, airline)
+        word_map[token][airline] += 1
 
     for tol in tols:
         # additional variable declaration to avoid difference due to new variable declaration
@@ -80,17 +101,97 @@ def test_search_time_against_tolerance(df, lower, higher, search_word):
         end = time.perf_counter()
         linked_search_times.append(end - start)
 
+        # Trie (shared Levenshtein DP rows)
+        start = time.perf_counter()
+        trie.get_words_within_distance(search_word, tol)
+        end = time.perf_counter()
+        trie_search_times.append(end - start)
+
+        # Columnar BK Tree
+        start = time.perf_counter()
+        columnar_tree.get_similar_words(search_word, tol)
+        end = time.perf_counter()
+        columnar_search_times.append(end - start)
+
+        # Length-partitioned BK Trees
+        start = time.perf_counter()
+        length_bk_index.get_similar_words(search_word, tol)
+        end = time.perf_counter()
+        length_bk_search_times.append(end - start)
+
+        # SymSpell (only defined up to the tolerance it was built for)
+        if tol <= SYMSPELL_MAX_TOL:
+            start = time.perf_counter()
+            symspell_index.get_similar_words(search_word, tol)
+            end = time.perf_counter()
+            symspell_search_times.append(end - start)
+
+        # q-gram Index
+        start = time.perf_counter()
+        qgram_index.get_similar_words(search_word, tol)
+        end = time.perf_counter()
+        qgram_search_times.append(end - start)
+
+        # LAESA pivot table
+        start = time.perf_counter()
+        laesa_index.get_similar_words(search_word, tol)
+        end = time.perf_counter()
+        laesa_search_times.append(end - start)
+
+        print(f"✅ Completed tolerance {tol}")
+
+    return tols, (linear_search_times, array_search_times, linked_search_times, trie_search_times, columnar_search_times,
+                  length_bk_search_times, symspell_search_times,
+                  qgram_search_times, laesa_search_times)
+
+def test_distance_calls_against_tolerance(corpus, lower, higher, queries):
+    """
+    For the corpus, count the edit distance calls per query made by both BK trees, the
+    length-partitioned BK trees and the LAESA pivot table for tolerances between
+    lower (inclusive) to higher (exclusive)
+    """
+    array_calls = []
+    linked_calls = []
+    length_bk_calls = []
+    laesa_calls = []
+    tols = [i for i in range(lower, higher)]
+
+    pairs = list(corpus.iter_token_pairs())
+    indexes = [
+        (Array_BKTree.Array_BKTree(MAXN, MAX_DIST, instrument=True), array_calls),
+        (Linked_BKTree.Linked_BKTree(instrument=True), linked_calls),
+        (Length_Partitioned_Index.Length_Partitioned_Index(instrument=True), length_bk_calls),
+        (LAESA_Index.LAESA_Index(LAESA_NUM_PIVOTS, instrument=True), laesa_calls),
+    ]
+    for index, _ in indexes:
+        index.build_from(pairs)
+
+    for tol in tols:
+        for index, calls in indexes:
+            index.reset_stats()
+            for query in queries:
+                index.get_similar_words(query, tol)
+            calls.append(index.stats()["distance_calls"] / len(queries))
+
         print(f"✅ Completed tolerance {tol}")
 
-    return tols, (linear_search_times, array_search_times, linked_search_times)
+    return tols, (array_calls, linked_calls, length_bk_calls, laesa_calls)
 
 
-def plot_result(tols, linear_search_times_tol, array_search_times_tol, linked_search_times_tol):
+def plot_result(tols, linear_search_times_tol, array_search_times_tol, linked_search_times_tol, trie_search_times_tol, columnar_search_times_tol,
+                length_bk_search_times_tol, symspell_search_times_tol,
+                qgram_search_times_tol, laesa_search_times_tol):
 
     # Subplot 4: Search time vs tolerance
     plt.plot(tols, linear_search_times_tol, 'o-', label='Linear Search')
     plt.plot(tols, array_search_times_tol, 'o-', label='Array BK Tree')
     plt.plot(tols, linked_search_times_tol, 'o-', label='Linked BK Tree')
+    plt.plot(tols, trie_search_times_tol, 'o-', label='Trie (Levenshtein DP)')
+    plt.plot(tols, columnar_search_times_tol, 'o-', label='Columnar BK Tree')
+    plt.plot(tols, length_bk_search_times_tol, 'o-', label='Length-Partitioned BK Trees')
+    plt.plot(tols[:len(symspell_search_times_tol)], symspell_search_times_tol, 'o-', label='SymSpell')
+    plt.plot(tols, qgram_search_times_tol, 'o-', label='q-gram Index')
+    plt.plot(tols, laesa_search_times_tol, 'o-', label='LAESA Pivot Table')
     plt.xlabel('Tolerance (Edit Distance)')
     plt.ylabel('Time (s)')
     plt.title(f'Search Time vs Tolerance')
@@ -101,11 +202,35 @@ def plot_result(tols, linear_search_times_tol, array_search_times_tol, linked_se
     plt.savefig(f"{FIGURE_PATH}/approx_search_results_{datetime.now().strftime(DATE_FORMAT)}.png")
     plt.show()
 
+def plot_distance_calls(tols, array_calls, linked_calls, length_bk_calls, laesa_calls):
+    plt.plot(tols, array_calls, 'o-', label='Array BK Tree')
+    plt.plot(tols, linked_calls, 'o-', label='Linked BK Tree')
+    plt.plot(tols, length_bk_calls, 'o-', label='Length-Partitioned BK Trees')
+    plt.plot(tols, laesa_calls, 'o-', label='LAESA Pivot Table')
+    plt.xlabel('Tolerance (Edit Distance)')
+    plt.ylabel('Edit Distance Calls per Query')
+    plt.title('Distance Calls vs Tolerance')
+    plt.legend()
+    plt.grid(True)
+
+    plt.tight_layout()
+    plt.savefig(f"{FIGURE_PATH}/approx_distance_calls_{datetime.now().strftime(DATE_FORMAT)}.png")
+    plt.show()
+
 # Array BK Tree configs   
 MAXN = 1
 MAX_DIST = 50
 TOL = 2
 
+# SymSpell config: deletion variants are precomputed up to this tolerance
+SYMSPELL_MAX_TOL = 2
+
+# q-gram Index config: gram length
+QGRAM_Q = 2
+
+# LAESA config: number of pivot words
+LAESA_NUM_PIVOTS = 32
+
 # Configs for file paths and date output format
 FIGURE_PATH = "./figs"
 DATE_FORMAT = "%Y-%m-%d_%H-%M-%S"
@@ -114,12 +239,13 @@ COLUMN = "content"
 
 SEARCH_WORD = "delay"
 NUM_RUNS = 5
+NUM_DISTANCE_QUERIES = 20
 
 random.seed(123)
 
 if __name__ == "__main__":
     create_folder(FIGURE_PATH)
-    df = pd.read_csv(CSV_PATH)
+    corpus = Corpus.from_csv(CSV_PATH)
 
     # Initialize accumulators for averaging
     avg_results = None
@@ -127,7 +253,7 @@ if __name__ == "__main__":
     for run in range(NUM_RUNS):
         print(f"Running experiment {run + 1}/{NUM_RUNS}...")
     
-        tols, results = test_search_time_against_tolerance(df, 0, 21, SEARCH_WORD)
+        tols, results = test_search_time_against_tolerance(corpus, 0, 21, SEARCH_WORD)
 
         # Initialize accumulators on the first run
         if avg_results is None:
@@ -142,10 +268,22 @@ if __name__ == "__main__":
     avg_results = [[value / NUM_RUNS for value in result] for result in avg_results]
 
     # Unpack averaged results
-    linear_search_times, array_search_times, linked_search_times = avg_results
+    (
+        linear_search_times, array_search_times, linked_search_times, trie_search_times, columnar_search_times,
+        length_bk_search_times, symspell_search_times, qgram_search_times,
+        laesa_search_times
+    ) = avg_results
 
     # Create plot figure
     print("\nGenerating plot...")
-    plot_result(tols, linear_search_times, array_search_times, linked_search_times)
+    plot_result(tols, linear_search_times, array_search_times, linked_search_times, trie_search_times, columnar_search_times,
+                length_bk_search_times, symspell_search_times,
+                qgram_search_times, laesa_search_times)
+
+    # Distance calls are deterministic, so one run over a sample of query words is enough
+    print("\nCounting distance calls...")
+    queries = random.sample(sorted(corpus.vocab), NUM_DISTANCE_QUERIES)
+    tols, calls = test_distance_calls_against_tolerance(corpus, 0, 21, queries)
+    plot_distance_calls(tols, *calls)
 
     print(f"\nExperiments on BK tree for approximate search completed. You may find result figures in {FIGURE_PATH}")
\ No newline at end of file
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = "./.cache"
+
+
+def _pack(strings):
+    """Encode strings as one utf-8 byte array plus the offset where each one starts, and the end."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack(data, offsets):
+    text = data.tobytes()
+    return [text[lo:hi].decode("utf-8") for lo, hi in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+class Corpus:
+    """
+    A review dataset tokenized once.
+
+    Every review's lowercase [a-z]+ tokens are stored as one int32 stream of
+    vocabulary ids; review r owns tokens[offsets[r]:offsets[r + 1]] and was
+    written about airlines[airline_ids[r]]. Subsets (select / sample) share the
+    vocabulary, so builders get (word, airline) pairs or aggregated
+    (word, airline, count) triples without re-running the regex.
+    """
+
+    def __init__(self, vocab, airlines, tokens, offsets, airline_ids):
+        self.vocab = vocab              # token id -> word
+        self.airlines = airlines        # airline id -> name
+        self.tokens = tokens            # token ids of every review, back to back
+        self.offsets = offsets          # review -> start of its tokens, plus the end
+        self.airline_ids = airline_ids  # review -> airline id
+
+    def __len__(self):
+        return len(self.airline_ids)
+
+    @classmethod
+    def from_dataframe(cls, df, airline_column="airline_name", content_column="content"):
+        """Tokenize every review of df with pandas string ops."""
+        tokens = df[content_column].map(str).str.lower().str.findall(r"[a-z]+")
+        token_ids, vocab = pd.factorize(tokens.explode().dropna())
+        airline_ids, airlines = pd.factorize(df[airline_column].map(str))
+
+        offsets = np.zeros(len(df) + 1, dtype=np.int64)
+        np.cumsum(tokens.str.len().to_numpy(), out=offsets[1:])
+        return cls(vocab.tolist(), airlines.tolist(), token_ids.astype(np.int32),
+                   offsets, airline_ids.astype(np.int32))
+
+    @classmethod
+    def from_csv(cls, csv_path, airline_column="airline_name", content_column="content", cache_dir=CACHE_DIR):
+        """
+        Load csv_path tokenized, from the on-disk cache when its recorded size and
+        mtime still match the csv, otherwise tokenize it and rewrite the cache.
+        The cache is keyed by the csv's absolute path, so same-named files in
+        different directories get separate entries.
+        """
+        stat = os.stat(csv_path)
+        source = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+        path_key = hashlib.sha1(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:12]
+        name = f"{os.path.basename(csv_path)}.{path_key}.{airline_column}.{content_column}.npz"
+        cache_path = os.path.join(cache_dir, name)
+
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                if np.array_equal(cached["source"], source):
+                    return cls(_unpack(cached["vocab"], cached["vocab_offsets"]),
+                               _unpack(cached["airlines"], cached["airline_offsets"]),
+                               cached["tokens"], cached["offsets"], cached["airline_ids"])
+
+        corpus = cls.from_dataframe(pd.read_csv(csv_path), airline_column, content_column)
+        os.makedirs(cache_dir, exist_ok=True)
+        vocab, vocab_offsets = _pack(corpus.vocab)
+        airlines, airline_offsets = _pack(corpus.airlines)
+        # write then rename, so an interrupted run never leaves a truncated cache behind
+        with open(cache_path + ".tmp", "wb") as f:
+            np.savez(f, vocab=vocab, vocab_offsets=vocab_offsets, airlines=airlines, airline_offsets=airline_offsets,
+                     tokens=corpus.tokens, offsets=corpus.offsets, airline_ids=corpus.airline_ids, source=source)
+        os.replace(cache_path + ".tmp", cache_path)
+        return corpus
+
+    def select(self, reviews):
+        """Return the sub-corpus of the given review indices, in that order."""
+        reviews = np.asarray(reviews, dtype=np.int64)
+        starts = self.offsets[reviews]
+        lengths = self.offsets[reviews + 1] - starts
+        offsets = np.zeros(len(reviews) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # position of every token of the selected reviews in self.tokens
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return Corpus(self.vocab, self.airlines, self.tokens[positions], offsets, self.airline_ids[reviews])
+
+    def sample(self, n, random_state=None):
+        """Same reviews as DataFrame.sample(n, random_state=random_state) on the source rows."""
+        return self.select(np.random.RandomState(random_state).choice(len(self), size=n, replace=False))
+
+    def token_airline_ids(self):
+        """Airline id of every token."""
+        return np.repeat(self.airline_ids, np.diff(self.offsets))
+
+    def vocabulary_size(self):
+        """Number of distinct words."""
+        return len(np.unique(self.tokens))
+
+    def iter_token_pairs(self):
+        """Yield (token, airline) for every token, in review order."""
+        vocab, airlines = self.vocab, self.airlines
+        for token_id, airline_id in zip(self.tokens.tolist(), self.token_airline_ids().tolist()):
+            yield vocab[token_id], airlines[airline_id]
+
+    def iter_word_counts(self):
+        """Yield (word, airline, count) once per distinct word/airline pair."""
+        num_airlines = max(len(self.airlines), 1)
+        keys, counts = np.unique(self.tokens.astype(np.int64) * num_airlines + self.token_airline_ids(),
+                                 return_counts=True)
+        vocab, airlines = self.vocab, self.airlines
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            token_id, airline_id = divmod(key, num_airlines)
+            yield vocab[token_id], airlines[airline_id], count
@@ -1,32 +1,78 @@
-from collections import defaultdict
+import heapq
+from collections import Counter, defaultdict
 from Levenshtein import distance as levenshtein_distance
 
-class Array_BKTree:
+from data_structures.EntityDictionary import EntityDictionary
+from data_structures.Search_Stats import Search_Stats
+
+class Array_BKTree(Search_Stats):
     class Node:
         __slots__ = ('word', 'next', 'entity_counts')
         
         def __init__(self, max_dist=20, x=None):
             self.word = x
             self.next = [-1] * max_dist
-            self.entity_counts = defaultdict(int)
+            self.entity_counts = defaultdict(int)  # entity id -> count
 
-        def increment_entity(self, entity):
-            self.entity_counts[entity] += 1
+        def increment_entity(self, entity_id, count=1):
+            self.entity_counts[entity_id] += count
 
-    def __init__(self, maxn=1000, max_dist=20, edit_distance=levenshtein_distance):
+    def __init__(self, maxn=1000, max_dist=20, edit_distance=levenshtein_distance, entities=None, instrument=False):
         self.MAXN = maxn
         self.max_dist = max_dist
         self.tree = [None] * maxn
         self.ptr = 0
         self.edit_distance = edit_distance
+        self.entities = EntityDictionary.shared(entities)
+        self._instrument(instrument)
+
+    def stats(self):
+        """
+        Return the instrumentation counters (edit-distance calls, nodes visited,
+        branches pruned, deepest node visited) since the last reset_stats(),
+        plus the current tree shape: node count, height and a histogram of
+        children per node.
+        """
+        height, fanout = 0, Counter()
+        stack = [(0, 0)] if self.ptr else []
+        while stack:
+            node_idx, depth = stack.pop()
+            children = [next_idx for next_idx in self.tree[node_idx].next if next_idx != -1]
+            fanout[len(children)] += 1
+            height = max(height, depth)
+            stack.extend((child, depth + 1) for child in children)
+
+        return {
+            **self._counters(),
+            "nodes": self.ptr,
+            "height": height,
+            "fanout_histogram": dict(sorted(fanout.items())),
+        }
+
+    def add(self, word, entity="", count=1):
+        self._find_or_insert(word).increment_entity(self.entities.get_id(entity), count)
+
+    def build_from(self, pairs):
+        return self.build_from_counts((word, entity, 1) for word, entity in pairs)
 
-    def add(self, word, entity=""):
+    def build_from_counts(self, triples):
+        """
+        Bulk-load an iterable of (word, entity, count) triples,
+        e.g. from hashMapBaseline.iter_word_counts.
+        """
+        for word, counts in self.entities.aggregate(triples).items():
+            node = self._find_or_insert(word)
+            for entity_id, count in counts.items():
+                node.increment_entity(entity_id, count)
+        return self
+
+    def _find_or_insert(self, word):
+        """Return the node holding word, creating it if needed."""
         # Handle root case inline
         if self.ptr == 0:
             self.tree[0] = self.Node(self.max_dist, word)
-            self.tree[0].increment_entity(entity)
             self.ptr = 1
-            return
+            return self.tree[0]
         
         node_idx = 0
         while True:
@@ -34,8 +80,7 @@ class Array_BKTree:
             dist = self.edit_distance(word, node.word)
             
             if dist == 0:
-                node.increment_entity(entity)
-                return
+                return node
             
             # Bounds check
             if dist >= self.max_dist:
@@ -49,11 +94,10 @@ class Array_BKTree:
                 
                 # Create new node
                 new_node = self.Node(self.max_dist, word)
-                new_node.increment_entity(entity)
                 self.tree[self.ptr] = new_node
                 node.next[dist] = self.ptr
                 self.ptr += 1
-                return
+                return new_node
             
             node_idx = next_idx
 
@@ -65,42 +109,142 @@ class Array_BKTree:
 
     def get_similar_words(self, s: str, tol) -> list[str]:
         """Get list of similar words."""
-        nodes = self.get_similar_words_helper(0, s, tol)
-        return [node.word for node in nodes]
+        return [node.word for node in self._iter_similar_nodes(0, s, tol)]
     
+    def nearest(self, s: str, k) -> list[tuple[str, int]]:
+        """
+        Get the k closest words to s as (word, distance), closest first.
+        Subtrees are expanded best-first by their lower bound |d(s, parent) - edge|,
+        and only edges that can beat the current k-th best distance are followed.
+        """
+        if self.ptr == 0 or k <= 0:
+            return []
+
+        best = []  # max-heap of the k closest so far: (-distance, word)
+        frontier = [(0, 0, 0, 0)]  # min-heap: (lower bound, tie-breaker, node index, depth)
+        order = 1
+        while frontier:
+            bound, _, node_idx, depth = heapq.heappop(frontier)
+            if len(best) == k and bound >= -best[0][0]:
+                break  # nothing left can beat the k-th best
+
+            node = self.tree[node_idx]
+            dist = self.edit_distance(node.word, s)
+            if len(best) < k:
+                heapq.heappush(best, (-dist, node.word))
+            elif dist < -best[0][0]:
+                heapq.heapreplace(best, (-dist, node.word))
+
+            # every word under edge i is at distance i from node, hence >= |dist - i| from s
+            radius = -best[0][0] if len(best) == k else None
+            pushed = 0
+            for i, next_idx in enumerate(node.next):
+                if next_idx == -1:
+                    continue
+                lower = max(bound, abs(dist - i))
+                if radius is None or lower < radius:
+                    heapq.heappush(frontier, (lower, order, next_idx, depth + 1))
+                    order += 1
+                    pushed += 1
+            if self.instrument:
+                self._record_visit(depth, len(node.next) - node.next.count(-1) - pushed)
+
+        return sorted(((word, -neg_dist) for neg_dist, word in best), key=lambda x: (x[1], x[0]))
+
     def get_entity_rank_by_similar_words(self, s: str, tol) -> list[tuple[str, int]]:
         """Get ranked list of entities by frequency."""
-        result = defaultdict(int)
-        similar_nodes = self.get_similar_words_helper(0, s, tol)
-        
-        for node in similar_nodes:
-            for entity, count in node.entity_counts.items():
-                result[entity] += count
-        
-        return sorted(result.items(), key=lambda x: x[1], reverse=True)
+        return self.entities.rank(self.similar_entity_totals(s, tol))
+
+    def similar_entity_totals(self, s: str, tol, totals=None) -> list[int]:
+        """
+        Add the entity id counts of every word within tol of s into a dense
+        totals vector (a fresh one if not given) and return it.
+        """
+        if totals is None:
+            totals = self.entities.new_totals()
+        add_counts = self.entities.add_counts
+
+        # aggregate while traversing instead of collecting nodes first
+        for node in self._iter_similar_nodes(0, s, tol):
+            add_counts(totals, node.entity_counts)
+        return totals
+
+    def search_many(self, queries, tol) -> list[list[tuple[str, int]]]:
+        """
+        Rank entities for every query in a single traversal.
+        Each stack entry carries the queries still alive in that subtree, and a query
+        only follows edges inside its own [dist - tol, dist + tol] window.
+        Returns one ranking per query, in the order given.
+        """
+        queries = list(queries)
+        unique = list(dict.fromkeys(queries))
+        totals = [self.entities.new_totals() for _ in unique]
+        add_counts = self.entities.add_counts
+        edit_distance = self.edit_distance
+
+        stack = [(0, list(range(len(unique))), 0)] if self.ptr and unique else []
+        while stack:
+            node_idx, active, depth = stack.pop()
+            node = self.tree[node_idx]
+            if not node or not node.word:
+                continue
+
+            dists = []
+            for q in active:
+                dist = edit_distance(node.word, unique[q])
+                if dist <= tol:
+                    add_counts(totals[q], node.entity_counts)
+                dists.append(dist)
+
+            low = max(0, min(dists) - tol)
+            high = min(max(dists) + tol, len(node.next) - 1)
+            pushed = 0
+            for i in range(low, high + 1):
+                next_idx = node.next[i]
+                if next_idx != -1:
+                    child_active = [q for q, dist in zip(active, dists) if abs(dist - i) <= tol]
+                    if child_active:
+                        stack.append((next_idx, child_active, depth + 1))
+                        pushed += 1
+            if self.instrument:
+                self._record_visit(depth, len(node.next) - node.next.count(-1) - pushed)
+
+        rankings = {query: self.entities.rank(t) for query, t in zip(unique, totals)}
+        return [rankings[query] for query in queries]
 
     def get_similar_words_helper(self, node_idx, s, tol):
-        """Recursively find similar words."""
+        """Find similar nodes in the subtree rooted at node_idx."""
+        return list(self._iter_similar_nodes(node_idx, s, tol))
+
+    def _iter_similar_nodes(self, node_idx, s, tol):
+        """Lazily yield similar nodes in pre-order, using an explicit stack."""
         if node_idx == -1:
-            return []
-        
-        node = self.tree[node_idx]
-        if not node or not node.word:
-            return []
+            return
 
-        results = []
-        dist = self.edit_distance(node.word, s)
+        tree = self.tree
+        edit_distance = self.edit_distance
+        instrument = self.instrument
+        stack = [node_idx]
+        depths = [0]  # parallel to stack, only kept up when instrumented
+        while stack:
+            node = tree[stack.pop()]
+            if instrument:
+                depth = depths.pop()
+            if not node or not node.word:
+                continue
 
-        if dist <= tol:
-            results.append(node)
-        
-        # Only check valid distance range
-        low = max(0, dist - tol)
-        high = min(self.max_dist - 1, dist + tol)
-        
-        for i in range(low, high + 1):
-            next_idx = node.next[i]
-            if next_idx != -1:
-                results.extend(self.get_similar_words_helper(next_idx, s, tol))
-        
-        return results
\ No newline at end of file
+            dist = edit_distance(node.word, s)
+            if dist <= tol:
+                yield node
+
+            if instrument:
+                before = len(stack)
+            # Only check valid distance range; the slice also covers
+            # slots appended past max_dist by add()
+            for next_idx in reversed(node.next[max(0, dist - tol):dist + tol + 1]):
+                if next_idx != -1:
+                    stack.append(next_idx)
+            if instrument:
+                pushed = len(stack) - before
+                depths.extend([depth + 1] * pushed)
+                self._record_visit(depth, len(node.next) - node.next.count(-1) - pushed)
\ No newline at end of file
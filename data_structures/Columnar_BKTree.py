@@ -0,0 +1,151 @@
+from array import array
+from Levenshtein import distance as levenshtein_distance
+
+from data_structures.EntityDictionary import EntityDictionary
+
+class Columnar_BKTree:
+    """
+    BK-tree stored column-wise instead of as Node objects.
+
+    - words: string pool, node id -> word
+    - first_child / next_sibling / edge_dist: int arrays; a node's children form a
+      chain sorted by their distance to it, so a query stops at dist + tol
+    - count_start / count_ids / count_values: CSR table, node id -> {entity id: count}
+
+    Counts are staged in a dict as words are added and folded into the CSR table
+    on the next query (or compact()), so bulk-load with build_from / build_from_counts.
+    """
+
+    def __init__(self, edit_distance=levenshtein_distance, entities=None):
+        self.words = []
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.edge_dist = array('i')  # node id -> distance to its parent
+        self.count_start = array('i', [0])
+        self.count_ids = array('i')
+        self.count_values = array('i')
+        self.pending = {}  # node id -> {entity id: count} not yet in the CSR table
+        self.edit_distance = edit_distance
+        self.entities = EntityDictionary.shared(entities)
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, word, entity="", count=1):
+        counts = self.pending.setdefault(self._find_or_insert(word), {})
+        entity_id = self.entities.get_id(entity)
+        counts[entity_id] = counts.get(entity_id, 0) + count
+
+    def build_from(self, pairs):
+        return self.build_from_counts((word, entity, 1) for word, entity in pairs)
+
+    def build_from_counts(self, triples):
+        """
+        Bulk-load an iterable of (word, entity, count) triples, e.g. from
+        hashMapBaseline.iter_word_counts.
+        """
+        pending = self.pending
+        for word, counts in self.entities.aggregate(triples).items():
+            node_counts = pending.setdefault(self._find_or_insert(word), {})
+            for entity_id, count in counts.items():
+                node_counts[entity_id] = node_counts.get(entity_id, 0) + count
+        return self
+
+    def compact(self):
+        """
+        Fold staged counts into a fresh CSR table. Done on the next query;
+        call it directly before measuring size.
+        """
+        if not self.pending:
+            return self
+        pending = self.pending
+        start, ids, values = array('i', [0]), array('i'), array('i')
+        for node in range(len(self.words)):
+            counts = pending.get(node, {})
+            if node + 1 < len(self.count_start):
+                for k in range(self.count_start[node], self.count_start[node + 1]):
+                    entity_id = self.count_ids[k]
+                    counts[entity_id] = counts.get(entity_id, 0) + self.count_values[k]
+            for entity_id in sorted(counts):
+                ids.append(entity_id)
+                values.append(counts[entity_id])
+            start.append(len(ids))
+        self.count_start, self.count_ids, self.count_values = start, ids, values
+        self.pending = {}
+        return self
+
+    def _find_or_insert(self, word):
+        """Return the node id holding word, creating it if needed."""
+        if not self.words:
+            return self._new_node(word, 0)
+
+        first_child, next_sibling, edge_dist = self.first_child, self.next_sibling, self.edge_dist
+        node = 0
+        while True:
+            dist = self.edit_distance(word, self.words[node])
+            if dist == 0:
+                return node
+
+            # walk the sorted chain to the child at dist, or to where it belongs
+            prev, child = -1, first_child[node]
+            while child != -1 and edge_dist[child] < dist:
+                prev, child = child, next_sibling[child]
+            if child == -1 or edge_dist[child] != dist:
+                new = self._new_node(word, dist)
+                next_sibling[new] = child
+                if prev == -1:
+                    first_child[node] = new
+                else:
+                    next_sibling[prev] = new
+                return new
+            node = child
+
+    def _new_node(self, word, dist):
+        self.words.append(word)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self.edge_dist.append(dist)
+        return len(self.words) - 1
+
+    def _iter_similar_nodes(self, s, tol):
+        """Lazily yield similar node ids in pre-order, using an explicit stack."""
+        if not self.words:
+            return
+
+        words = self.words
+        first_child, next_sibling, edge_dist = self.first_child, self.next_sibling, self.edge_dist
+        edit_distance = self.edit_distance
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            dist = edit_distance(words[node], s)
+            if dist <= tol:
+                yield node
+
+            low, high = dist - tol, dist + tol
+            window = []
+            child = first_child[node]
+            while child != -1:
+                d = edge_dist[child]
+                if d > high:
+                    break
+                if d >= low:
+                    window.append(child)
+                child = next_sibling[child]
+            # push in reverse so the smallest distance is visited first
+            window.reverse()
+            stack.extend(window)
+
+    def get_similar_words(self, s: str, tol) -> list[str]:
+        """Get list of similar words."""
+        return [self.words[node] for node in self._iter_similar_nodes(s, tol)]
+
+    def get_entity_rank_by_similar_words(self, s: str, tol) -> list[tuple[str, int]]:
+        """Get ranked list of entities by frequency."""
+        self.compact()
+        totals = self.entities.new_totals()
+        start, ids, values = self.count_start, self.count_ids, self.count_values
+        for node in self._iter_similar_nodes(s, tol):
+            for k in range(start[node], start[node + 1]):
+                totals[ids[k]] += values[k]
+        return self.entities.rank(totals)
@@ -0,0 +1,82 @@
+import heapq
+
+class EntityDictionary:
+    """
+    Interns entity names (e.g. airline names) as small consecutive integer ids.
+
+    Indexes key their count tables by id, so each name is stored and hashed once.
+    Rankings aggregate into a dense list indexed by id and only translate back
+    to names at the end.
+
+    Every index takes an optional entities= argument (see shared()); pass the
+    same instance to several indexes so their ids agree and counts add up directly.
+    """
+
+    def __init__(self):
+        self.ids = {}    # name -> id
+        self.names = []  # id -> name
+
+    @classmethod
+    def shared(cls, entities=None):
+        """Return entities if one is given, otherwise a fresh dictionary."""
+        return entities if entities is not None else cls()
+
+    def __len__(self):
+        return len(self.names)
+
+    def get_id(self, name):
+        """Return the id for name, assigning the next free id if it is new."""
+        entity_id = self.ids.get(name)
+        if entity_id is None:
+            entity_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return entity_id
+
+    def find_id(self, name):
+        """Return the id for name, or -1 if it has never been seen."""
+        return self.ids.get(name, -1)
+
+    def name(self, entity_id):
+        return self.names[entity_id]
+
+    def decode(self, counts):
+        """Translate an {id: count} mapping into {name: count}."""
+        names = self.names
+        return {names[entity_id]: count for entity_id, count in counts.items()}
+
+    def aggregate(self, triples):
+        """
+        Sum (word, entity, count) triples into {word: {id: count}}, so a bulk
+        load visits each distinct word once however often it occurs.
+        """
+        get_id = self.get_id
+        word_counts = {}
+        for word, entity, count in triples:
+            counts = word_counts.get(word)
+            if counts is None:
+                counts = word_counts[word] = {}
+            entity_id = get_id(entity)
+            counts[entity_id] = counts.get(entity_id, 0) + count
+        return word_counts
+
+    def new_totals(self):
+        """Return a zeroed dense count vector with one slot per known entity."""
+        return [0] * len(self.names)
+
+    @staticmethod
+    def add_counts(totals, counts):
+        """Add a sparse {id: count} mapping into a dense totals vector."""
+        for entity_id, count in counts.items():
+            totals[entity_id] += count
+
+    def rank(self, totals, top_k=None):
+        """
+        Turn a dense totals vector (or sparse {id: count} mapping) into a list of
+        (name, count) sorted by count descending, truncated to top_k if given.
+        """
+        items = totals.items() if isinstance(totals, dict) else enumerate(totals)
+        names = self.names
+        pairs = [(names[entity_id], count) for entity_id, count in items if count]
+        if top_k is not None:
+            return heapq.nlargest(top_k, pairs, key=lambda x: x[1])
+        return sorted(pairs, key=lambda x: x[1], reverse=True)
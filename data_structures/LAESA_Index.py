@@ -0,0 +1,146 @@
+import random
+from collections import defaultdict
+from Levenshtein import distance as levenshtein_distance
+import numpy as np
+
+from data_structures.EntityDictionary import EntityDictionary
+from data_structures.Search_Stats import Search_Stats
+
+class LAESA_Index(Search_Stats):
+    """
+    Pivot-table metric index (LAESA).
+
+    A few vocabulary words are chosen as pivots and every word's distance to each
+    pivot is stored in a words x pivots table. By the triangle inequality
+    |d(s, p) - d(w, p)| <= d(s, w), so a query computes its distance to the pivots
+    only and verifies just the words whose largest such bound is <= tol.
+
+    BK-tree children cluster on the few distances short words can have; here the
+    pivots are instead picked greedily to maximise the average bound they give on
+    a random sample of word pairs, i.e. pivots whose distances spread words apart.
+    Pivots are fixed on the first build_from() or query; words added later only
+    get their own row.
+    """
+
+    COUNTERS = ("distance_calls", "candidates_verified")
+
+    def __init__(self, num_pivots=32, sample_size=256, edit_distance=levenshtein_distance,
+                 entities=None, instrument=False, seed=123):
+        self.num_pivots = num_pivots
+        self.sample_size = sample_size
+        self.edit_distance = edit_distance
+        self.entities = EntityDictionary.shared(entities)
+        self.rng = random.Random(seed)
+
+        self.words = []        # word id -> word
+        self.word_ids = {}     # word -> word id
+        self.word_counts = []  # word id -> {entity id: count}
+        self.pivots = None     # pivot words, chosen once
+        self.table = np.zeros((0, 0), dtype=np.int32)  # word id -> distances to pivots
+        self.pending_rows = []  # rows for words added after the table was built
+        self._instrument(instrument)
+
+    def stats(self)->dict:
+        """
+        Return the instrumentation counters (edit-distance calls, candidates that
+        survived the pivot filter) since the last reset_stats(), plus the number of
+        words and pivots.
+        """
+        return {
+            **self._counters(),
+            "words": len(self.words),
+            "pivots": len(self.pivots or ()),
+        }
+
+    def _counts_for(self, word):
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            word_id = self.word_ids[word] = len(self.words)
+            self.words.append(word)
+            self.word_counts.append(defaultdict(int))
+            if self.pivots is not None:
+                self.pending_rows.append([self.edit_distance(word, p) for p in self.pivots])
+        return self.word_counts[word_id]
+
+    def add(self, word, entity=""):
+        self._counts_for(word)[self.entities.get_id(entity)] += 1
+
+    def build_from(self, pairs):
+        """
+        Bulk-load an iterable of (word, entity) pairs, then choose the pivots
+        and fill the distance table if that has not happened yet.
+        """
+        get_id = self.entities.get_id
+        for word, entity in pairs:
+            self._counts_for(word)[get_id(entity)] += 1
+        self._table()
+        return self
+
+    def _select_pivots(self):
+        """
+        Greedy incremental pivot selection over a sample of the vocabulary: each
+        step adds the sample word that most raises the mean lower bound
+        max_p |d(x, p) - d(y, p)| over random sample pairs (x, y).
+        """
+        sample = self.rng.sample(self.words, min(self.sample_size, len(self.words)))
+        dist = np.array([[self.edit_distance(a, b) for b in sample] for a in sample], dtype=np.int32)
+
+        num_pairs = 4 * len(sample)
+        left = np.array([self.rng.randrange(len(sample)) for _ in range(num_pairs)])
+        right = np.array([self.rng.randrange(len(sample)) for _ in range(num_pairs)])
+        # gain[c, k]: bound pivot candidate c gives on pair k
+        gain = np.abs(dist[:, left] - dist[:, right])
+
+        bound = np.zeros(num_pairs, dtype=np.int32)
+        chosen = []
+        for _ in range(min(self.num_pivots, len(sample))):
+            score = np.maximum(gain, bound).mean(axis=1)
+            score[chosen] = -1
+            best = int(score.argmax())
+            chosen.append(best)
+            bound = np.maximum(bound, gain[best])
+        return [sample[c] for c in chosen]
+
+    def _table(self):
+        """Return the distance table, choosing pivots and appending pending rows first."""
+        if self.pivots is None and self.words:
+            self.pivots = self._select_pivots()
+            self.table = np.array([[self.edit_distance(w, p) for p in self.pivots] for w in self.words],
+                                  dtype=np.int32)
+        elif self.pending_rows:
+            self.table = np.vstack([self.table, np.array(self.pending_rows, dtype=np.int32)])
+            self.pending_rows = []
+        return self.table
+
+    def _iter_similar_ids(self, s, tol):
+        """Yield ids of words within tol of s, verifying only unpruned candidates."""
+        table = self._table()
+        if not self.words:
+            return
+
+        pivot_dists = np.array([self.edit_distance(s, p) for p in self.pivots], dtype=np.int32)
+        bounds = np.abs(table - pivot_dists).max(axis=1)
+        candidates = np.flatnonzero(bounds <= tol)
+        if self.instrument:
+            self.candidates_verified += len(candidates)
+
+        known = dict(zip(self.pivots, pivot_dists.tolist()))
+        words = self.words
+        for word_id in candidates.tolist():
+            word = words[word_id]
+            d = known.get(word)
+            if d is None:
+                d = self.edit_distance(word, s)
+            if d <= tol:
+                yield word_id
+
+    def get_similar_words(self, s, tol):
+        """Get list of similar words."""
+        return [self.words[word_id] for word_id in self._iter_similar_ids(s, tol)]
+
+    def get_entity_rank_by_similar_words(self, s, tol):
+        """Get ranked list of entities by frequency."""
+        totals = self.entities.new_totals()
+        for word_id in self._iter_similar_ids(s, tol):
+            self.entities.add_counts(totals, self.word_counts[word_id])
+        return self.entities.rank(totals)
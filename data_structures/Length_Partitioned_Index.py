@@ -0,0 +1,79 @@
+from collections import defaultdict
+from Levenshtein import distance as levenshtein_distance
+
+from data_structures.EntityDictionary import EntityDictionary
+from data_structures.Linked_BKTree import Linked_BKTree
+
+class Length_Partitioned_Index:
+    """
+    Fuzzy index with one bucket per word length.
+
+    Words whose lengths differ by more than tol are always more than tol edits
+    apart, so a query only searches the buckets for len(s) - tol .. len(s) + tol.
+    Each bucket is a BK-tree (Linked_BKTree or Array_BKTree); all buckets share
+    one EntityDictionary so their id counts add up directly.
+    """
+
+    def __init__(self, bucket_factory=Linked_BKTree, edit_distance=levenshtein_distance, entities=None,
+                 instrument=False):
+        self.bucket_factory = bucket_factory
+        self.edit_distance = edit_distance
+        self.entities = EntityDictionary.shared(entities)
+        self.buckets = {}  # word length -> bucket
+        # passed on to every bucket, see stats()
+        self.instrument = instrument
+
+    def _bucket(self, length):
+        bucket = self.buckets.get(length)
+        if bucket is None:
+            options = {"instrument": True} if self.instrument else {}
+            bucket = self.buckets[length] = self.bucket_factory(
+                edit_distance=self.edit_distance, entities=self.entities, **options)
+        return bucket
+
+    def reset_stats(self):
+        """Zero the instrumentation counters of every bucket."""
+        for bucket in self.buckets.values():
+            bucket.reset_stats()
+
+    def stats(self)->dict:
+        """
+        Return the edit-distance calls summed over all buckets since the last
+        reset_stats(), plus the number of buckets.
+        """
+        return {
+            "distance_calls": sum(bucket.stats()["distance_calls"] for bucket in self.buckets.values()),
+            "buckets": len(self.buckets),
+        }
+
+    def add(self, word, entity=""):
+        self._bucket(len(word)).add(word, entity)
+
+    def build_from(self, pairs):
+        """Bulk-load (word, entity) pairs, one build_from call per bucket."""
+        by_length = defaultdict(list)
+        for word, entity in pairs:
+            by_length[len(word)].append((word, entity))
+        for length, bucket_pairs in by_length.items():
+            self._bucket(length).build_from(bucket_pairs)
+        return self
+
+    def _candidate_buckets(self, s, tol):
+        for length in range(max(0, len(s) - tol), len(s) + tol + 1):
+            bucket = self.buckets.get(length)
+            if bucket is not None:
+                yield bucket
+
+    def get_similar_words(self, s, tol):
+        """Get list of similar words."""
+        results = []
+        for bucket in self._candidate_buckets(s, tol):
+            results.extend(bucket.get_similar_words(s, tol))
+        return results
+
+    def get_entity_rank_by_similar_words(self, s, tol):
+        """Get ranked list of entities by frequency, summed across buckets."""
+        totals = self.entities.new_totals()
+        for bucket in self._candidate_buckets(s, tol):
+            bucket.similar_entity_totals(s, tol, totals)
+        return self.entities.rank(totals)
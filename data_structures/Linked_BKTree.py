@@ -1,65 +1,211 @@
-from collections import defaultdict
+import heapq
+from collections import Counter, defaultdict
 from Levenshtein import distance as levenshtein_distance
 
-class Linked_BKTree:
+from data_structures.EntityDictionary import EntityDictionary
+from data_structures.Search_Stats import Search_Stats
+
+class Linked_BKTree(Search_Stats):
     class Node:
         def __init__(self, x=None):
             self.word = x
             self.children = {}  # distance -> Node
-            self.entity_counts = defaultdict(int)
+            self.entity_counts = defaultdict(int)  # entity id -> count
 
-        def increment_entity(self, entity):
-            self.entity_counts[entity] += 1
+        def increment_entity(self, entity_id, count=1):
+            self.entity_counts[entity_id] += count
 
-    def __init__(self, edit_distance=levenshtein_distance):
+    def __init__(self, edit_distance=levenshtein_distance, entities=None, instrument=False):
         self.root = self.Node()
         self.edit_distance = edit_distance
+        self.entities = EntityDictionary.shared(entities)
+        self._instrument(instrument)
+
+    def stats(self)->dict:
+        """
+        Return the instrumentation counters (edit-distance calls, nodes visited,
+        branches pruned, deepest node visited) since the last reset_stats(),
+        plus the current tree shape: node count, height and a histogram of
+        children per node.
+        """
+        nodes, height, fanout = 0, 0, Counter()
+        stack = [(self.root, 0)] if self.root.word else []
+        while stack:
+            curr, depth = stack.pop()
+            nodes += 1
+            fanout[len(curr.children)] += 1
+            height = max(height, depth)
+            stack.extend((child, depth + 1) for child in curr.children.values())
+
+        return {
+            **self._counters(),
+            "nodes": nodes,
+            "height": height,
+            "fanout_histogram": dict(sorted(fanout.items())),
+        }
+
+    def add(self, word: str, entity: str="", count: int=1):
+        self._find_or_insert(word).increment_entity(self.entities.get_id(entity), count)
+
+    def build_from(self, pairs):
+        return self.build_from_counts((word, entity, 1) for word, entity in pairs)
 
-    def add(self, word: str, entity: str=""):
+    def build_from_counts(self, triples):
+        """
+        Bulk-load an iterable of (word, entity, count) triples,
+        e.g. from hashMapBaseline.iter_word_counts.
+        """
+        for word, counts in self.entities.aggregate(triples).items():
+            node = self._find_or_insert(word)
+            for entity_id, count in counts.items():
+                node.increment_entity(entity_id, count)
+        return self
+
+    def _find_or_insert(self, word: str) -> Node:
+        """Return the node holding word, creating it if needed."""
         if not self.root.word:
             self.root.word = word
-            self.root.increment_entity(entity)
-            return
+            return self.root
 
         curr = self.root
         while True:
             d = self.edit_distance(word, curr.word)
             
             if d == 0:
-                curr.increment_entity(entity)
-                return
+                return curr
             
             if d not in curr.children:
                 curr.children[d] = self.Node(word)
-                curr.children[d].increment_entity(entity)
-                return
+                return curr.children[d]
             
             curr = curr.children[d]
 
     def get_similar_words_helper(self, curr: Node, s: str, tol)->list[Node]:
-        results = []
-        if not curr or not curr.word:
-            return results
-        
-        d = self.edit_distance(curr.word, s)
-        if d <= tol:
-            results.append(curr)
-
-        low = max(0, d - tol)
-        high = d + tol
-        for i in range(low, high + 1):
-            if i in curr.children:
-                results += self.get_similar_words_helper(curr.children[i], s, tol)
-        return results
+        return list(self._iter_similar_nodes(curr, s, tol))
+
+    def _iter_similar_nodes(self, curr: Node, s: str, tol):
+        """Lazily yield similar nodes in pre-order, using an explicit stack."""
+        edit_distance = self.edit_distance
+        instrument = self.instrument
+        stack = [curr]
+        depths = [0]  # parallel to stack, only kept up when instrumented
+        while stack:
+            curr = stack.pop()
+            if instrument:
+                depth = depths.pop()
+            if not curr or not curr.word:
+                continue
+
+            d = edit_distance(curr.word, s)
+            if d <= tol:
+                yield curr
+
+            if instrument:
+                before = len(stack)
+            children = curr.children
+            low = max(0, d - tol)
+            high = d + tol
+            # push in reverse so the smallest distance is visited first
+            for i in range(high, low - 1, -1):
+                child = children.get(i)
+                if child is not None:
+                    stack.append(child)
+            if instrument:
+                pushed = len(stack) - before
+                depths.extend([depth + 1] * pushed)
+                self._record_visit(depth, len(children) - pushed)
 
     def get_similar_words(self, s, tol):
-        similar_word_nodes = self.get_similar_words_helper(self.root, s, tol)
-        return list(map(lambda node: node.word, similar_word_nodes))
+        return [node.word for node in self._iter_similar_nodes(self.root, s, tol)]
+
+    def search_many(self, queries, tol)->list[list[tuple[str, int]]]:
+        """
+        Rank entities for every query in a single traversal.
+        Each stack entry carries the queries still alive in that subtree, and a query
+        only follows edges inside its own [d - tol, d + tol] window.
+        Returns one ranking per query, in the order given.
+        """
+        queries = list(queries)
+        unique = list(dict.fromkeys(queries))
+        totals = [self.entities.new_totals() for _ in unique]
+        add_counts = self.entities.add_counts
+        edit_distance = self.edit_distance
+
+        stack = [(self.root, list(range(len(unique))), 0)] if unique else []
+        while stack:
+            curr, active, depth = stack.pop()
+            if not curr or not curr.word:
+                continue
+
+            dists = []
+            for q in active:
+                d = edit_distance(curr.word, unique[q])
+                if d <= tol:
+                    add_counts(totals[q], curr.entity_counts)
+                dists.append(d)
+
+            pushed = 0
+            for i, child in curr.children.items():
+                child_active = [q for q, d in zip(active, dists) if abs(d - i) <= tol]
+                if child_active:
+                    stack.append((child, child_active, depth + 1))
+                    pushed += 1
+            if self.instrument:
+                self._record_visit(depth, len(curr.children) - pushed)
+
+        rankings = {query: self.entities.rank(t) for query, t in zip(unique, totals)}
+        return [rankings[query] for query in queries]
+
+    def nearest(self, s: str, k)->list[tuple[str, int]]:
+        """
+        Get the k closest words to s as (word, distance), closest first.
+        Subtrees are expanded best-first by their lower bound |d(s, parent) - edge|,
+        and only edges that can beat the current k-th best distance are followed.
+        """
+        if not self.root.word or k <= 0:
+            return []
+
+        best = []  # max-heap of the k closest so far: (-distance, word)
+        frontier = [(0, 0, self.root, 0)]  # min-heap: (lower bound, tie-breaker, node, depth)
+        order = 1
+        while frontier:
+            bound, _, curr, depth = heapq.heappop(frontier)
+            if len(best) == k and bound >= -best[0][0]:
+                break  # nothing left can beat the k-th best
+
+            d = self.edit_distance(curr.word, s)
+            if len(best) < k:
+                heapq.heappush(best, (-d, curr.word))
+            elif d < -best[0][0]:
+                heapq.heapreplace(best, (-d, curr.word))
+
+            # every word under edge i is at distance i from curr, hence >= |d - i| from s;
+            # edges go in distance order, as in Array_BKTree, so both break ties alike
+            radius = -best[0][0] if len(best) == k else None
+            pushed = 0
+            for i, child in sorted(curr.children.items()):
+                lower = max(bound, abs(d - i))
+                if radius is None or lower < radius:
+                    heapq.heappush(frontier, (lower, order, child, depth + 1))
+                    order += 1
+                    pushed += 1
+            if self.instrument:
+                self._record_visit(depth, len(curr.children) - pushed)
+
+        return sorted(((word, -neg_d) for neg_d, word in best), key=lambda x: (x[1], x[0]))
 
     def get_entity_rank_by_similar_words(self, s:str, tol)->dict[str: int]:
-        result = dict()
-        similar_nodes = self.get_similar_words_helper(self.root, s, tol)
-        for node in similar_nodes:
-            for entity, count in node.entity_counts.items():
-                result[entity] = result.get(entity, 0) + count
-        return sorted(result.items(), key=lambda x: x[1], reverse=True)
\ No newline at end of file
+        return self.entities.rank(self.similar_entity_totals(s, tol))
+
+    def similar_entity_totals(self, s: str, tol, totals=None)->list[int]:
+        """
+        Add the entity id counts of every word within tol of s into a dense
+        totals vector (a fresh one if not given) and return it.
+        """
+        if totals is None:
+            totals = self.entities.new_totals()
+        add_counts = self.entities.add_counts
+        # aggregate while traversing instead of collecting nodes first
+        for node in self._iter_similar_nodes(self.root, s, tol):
+            add_counts(totals, node.entity_counts)
+        return totals
\ No newline at end of file
@@ -0,0 +1,85 @@
+from collections import Counter, defaultdict
+from Levenshtein import distance as levenshtein_distance
+
+from data_structures.EntityDictionary import EntityDictionary
+
+class QGram_Index:
+    """
+    Fuzzy index over padded character q-grams with count filtering.
+
+    Each word is padded with q - 1 markers on both sides, giving len(word) + q - 1
+    q-grams, and one edit destroys at most q of them. So two words within edit
+    distance tol share at least max(len(s), len(w)) + q - 1 - tol * q q-grams
+    (counted with multiplicity). Candidates are found by merging the posting lists
+    of the query's q-grams, filtered by that count, then verified with edit_distance.
+    """
+
+    def __init__(self, q=2, edit_distance=levenshtein_distance, entities=None):
+        self.q = q
+        self.edit_distance = edit_distance
+        self.entities = EntityDictionary.shared(entities)
+        self.words = []        # word id -> word
+        self.word_ids = {}     # word -> word id
+        self.word_counts = []  # word id -> {entity id: count}
+        self.postings = defaultdict(list)  # q-gram -> [(word id, multiplicity)]
+        self.by_length = defaultdict(list)  # word length -> word ids
+
+    def _grams(self, word):
+        padded = "\x02" * (self.q - 1) + word + "\x03" * (self.q - 1)
+        return Counter(padded[i:i + self.q] for i in range(len(padded) - self.q + 1))
+
+    def _counts_for(self, word):
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            word_id = self.word_ids[word] = len(self.words)
+            self.words.append(word)
+            self.word_counts.append(defaultdict(int))
+            self.by_length[len(word)].append(word_id)
+            for gram, multiplicity in self._grams(word).items():
+                self.postings[gram].append((word_id, multiplicity))
+        return self.word_counts[word_id]
+
+    def add(self, word, entity=""):
+        self._counts_for(word)[self.entities.get_id(entity)] += 1
+
+    def build_from(self, pairs):
+        get_id = self.entities.get_id
+        for word, entity in pairs:
+            self._counts_for(word)[get_id(entity)] += 1
+        return self
+
+    def _candidates(self, s, tol):
+        """Yield word ids that pass the length and q-gram count filters."""
+        q, n = self.q, len(s)
+        lengths = range(max(0, n - tol), n + tol + 1)
+
+        # lengths whose threshold is <= 0 cannot be filtered by q-grams at all
+        unfiltered = [length for length in lengths if max(n, length) + q - 1 - tol * q <= 0]
+        for length in unfiltered:
+            yield from self.by_length.get(length, ())
+
+        common = defaultdict(int)
+        for gram, query_multiplicity in self._grams(s).items():
+            for word_id, multiplicity in self.postings.get(gram, ()):
+                common[word_id] += min(query_multiplicity, multiplicity)
+
+        words = self.words
+        for word_id, shared in common.items():
+            length = len(words[word_id])
+            if abs(length - n) <= tol and length not in unfiltered \
+                    and shared >= max(n, length) + q - 1 - tol * q:
+                yield word_id
+
+    def get_similar_words(self, s, tol):
+        """Get list of similar words."""
+        words = self.words
+        return [words[word_id] for word_id in self._candidates(s, tol)
+                if self.edit_distance(words[word_id], s) <= tol]
+
+    def get_entity_rank_by_similar_words(self, s, tol):
+        """Get ranked list of entities by frequency."""
+        totals = self.entities.new_totals()
+        for word_id in self._candidates(s, tol):
+            if self.edit_distance(self.words[word_id], s) <= tol:
+                self.entities.add_counts(totals, self.word_counts[word_id])
+        return self.entities.rank(totals)
@@ -0,0 +1,166 @@
+from collections import defaultdict
+
+from data_structures.EntityDictionary import EntityDictionary
+
+class Node:
+    def __init__(self, label=""):
+        # letters on the edge leading into this node (single-child chains are merged)
+        self.label = label
+        # first letter of child label → child Node
+        self.children = {}
+        self.is_end_of_word = False
+        # airline id → count of times this word appears for that airline in its comments
+        self.airline_counts = defaultdict(int)
+        # airline id → total count over every word in this node's subtree
+        self.subtree_counts = defaultdict(int)
+
+    def set_end(self):
+        self.is_end_of_word = True
+
+    def is_end(self):
+        return self.is_end_of_word
+
+
+def _clean(word):
+    # same normalisation as Trie: lowercase, letters a–z only
+    return "".join(ch for ch in word.lower() if 'a' <= ch <= 'z')
+
+
+class Radix_Trie:
+    def __init__(self, entities=None):
+        self.root = Node()
+        self.entities = EntityDictionary.shared(entities)
+
+    def insert(self, word, airline_name, count=1):
+        """
+        Insert a word and add count occurrences for airline_name.
+        Edges are split when the word diverges part-way along a label.
+        """
+        word = _clean(word)
+        airline_id = self.entities.get_id(airline_name)
+        node = self.root
+        node.subtree_counts[airline_id] += count
+        i = 0
+        while i < len(word):
+            child = node.children.get(word[i])
+            if child is None:
+                child = Node(word[i:])
+                node.children[word[i]] = child
+                child.subtree_counts[airline_id] += count
+                node = child
+                break
+
+            label = child.label
+            j, n = 1, min(len(label), len(word) - i)
+            while j < n and label[j] == word[i + j]:
+                j += 1
+
+            if j < len(label):
+                # split the edge: node -label[:j]-> mid -label[j:]-> child
+                mid = Node(label[:j])
+                mid.subtree_counts.update(child.subtree_counts)
+                child.label = label[j:]
+                mid.children[child.label[0]] = child
+                node.children[word[i]] = mid
+                child = mid
+
+            child.subtree_counts[airline_id] += count
+            node = child
+            i += j
+        node.set_end()
+        node.airline_counts[airline_id] += count
+
+    def _search_prefix(self, word):
+        """
+        Return (node, path) where node is the first node whose path starts with word,
+        or (None, None). path may extend past word when it ends inside an edge label.
+        """
+        word = _clean(word)
+        node, path = self.root, ""
+        while len(path) < len(word):
+            child = node.children.get(word[len(path)])
+            if child is None:
+                return None, None
+            label = child.label
+            if not word.startswith(label[:len(word) - len(path)], len(path)):
+                return None, None
+            node = child
+            path += label
+        return node, path
+
+    def get_airlines_for_word(self, word):
+        """
+        Return dict of airline → count for an exact word.
+        """
+        node, path = self._search_prefix(word)
+        if node and node.is_end() and path == _clean(word):
+            return self.entities.decode(node.airline_counts)
+        return {}
+
+    def get_words_and_airlines_starting_with(self, prefix):
+        """
+        Return list of (word, {airline: count}) for all words starting with prefix.
+        """
+        results = []
+        node, path = self._search_prefix(prefix)
+        if node is None:
+            return results
+
+        self._dfs(node, path, results)
+        return results
+
+    def _dfs(self, node, path, results):
+        if node.is_end():
+            results.append((path, self.entities.decode(node.airline_counts)))
+
+        for ch in sorted(node.children):
+            child = node.children[ch]
+            self._dfs(child, path + child.label, results)
+
+    def get_airline_ranking_for_prefix(self, prefix, top_k=None):
+        """
+        Aggregate total counts across all words starting with prefix.
+        Return airlines ranked by frequency (only the first top_k if given).
+        """
+        node, _ = self._search_prefix(prefix)
+        if node is None:
+            return []
+
+        # sort descending by frequency (bounded heap when top_k is given)
+        return self.entities.rank(node.subtree_counts, top_k)
+
+    def count_nodes(self):
+        """Return the number of nodes, for comparison against the plain Trie."""
+        count, stack = 0, [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
+
+
+# ------------------- Example Usage -------------------
+if __name__ == "__main__":
+    trie = Radix_Trie()
+
+    sample_data = [
+        ("delay", "AirAsia"),
+        ("delay", "AirAsia"),
+        ("delayed", "Jetstar"),
+        ("delays", "AirAsia"),
+        ("delight", "SingaporeAir"),
+        ("service", "Emirates"),
+    ]
+
+    for word, airline in sample_data:
+        trie.insert(word, airline)
+
+    print("Words and airline counts for prefix 'del':")
+    for word, counts in trie.get_words_and_airlines_starting_with("del"):
+        print(f"{word:10s} → {counts}")
+
+    print("\nAirline ranking for prefix 'del':")
+    for airline, total in trie.get_airline_ranking_for_prefix("del"):
+        print(f"{airline:15s} {total}")
+
+    print(f"\nNodes: {trie.count_nodes()}")
@@ -0,0 +1,35 @@
+class Search_Stats:
+    """
+    Optional search counters shared by the fuzzy indexes.
+
+    With instrument=True, edit_distance is wrapped to count its calls and the
+    traversals record visits; with it off, queries only pay a bool check per node.
+    COUNTERS names the counters reset_stats() zeroes and stats() reports.
+    """
+
+    COUNTERS = ("distance_calls", "nodes_visited", "branches_pruned", "max_depth")
+
+    def _instrument(self, instrument):
+        """Set up the counters; call after self.edit_distance is assigned."""
+        self.instrument = instrument
+        self.reset_stats()
+        if instrument:
+            edit_distance = self.edit_distance
+            def counted_edit_distance(a, b):
+                self.distance_calls += 1
+                return edit_distance(a, b)
+            self.edit_distance = counted_edit_distance
+
+    def reset_stats(self):
+        """Zero the instrumentation counters."""
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+
+    def _record_visit(self, depth, pruned):
+        self.nodes_visited += 1
+        self.branches_pruned += pruned
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def _counters(self):
+        return {name: getattr(self, name) for name in self.COUNTERS}
@@ -0,0 +1,142 @@
+import multiprocessing as mp
+import traceback
+
+from data_structures.Array_BKTree import Array_BKTree
+from data_structures.EntityDictionary import EntityDictionary
+
+
+def _shard_worker(conn, maxn, max_dist):
+    """
+    Long-lived worker loop: owns one Array_BKTree and answers requests on conn
+    until it receives "close". Every request but "add" gets one ("ok", result)
+    or ("error", traceback) reply; a failed "add" is reported with the next reply.
+    """
+    tree = Array_BKTree(maxn, max_dist)
+    handlers = {
+        "build": lambda triples: tree.build_from_counts(triples).ptr,
+        "add": tree.add,
+        "words": tree.get_similar_words,
+        "rank": tree.get_entity_rank_by_similar_words,
+        "rank_many": tree.search_many,
+    }
+    error = None
+    while True:
+        op, *args = conn.recv()
+        if op == "close":
+            conn.close()
+            return
+        result = None
+        try:
+            result = handlers[op](*args)
+        except Exception:
+            error = error or traceback.format_exc()
+        if op != "add":
+            conn.send(("error", error) if error else ("ok", result))
+            error = None
+
+
+class Sharded_BKTree:
+    """
+    Fuzzy index split across worker processes.
+
+    Words are hashed to one of num_shards long-lived workers, each holding its
+    own Array_BKTree, so a tree is built once and then queried many times.
+    A query is sent to every shard at once and the entity counts are merged here.
+    Call close() (or use it as a context manager) to stop the workers.
+    """
+
+    def __init__(self, num_shards=None, maxn=1000, max_dist=20):
+        self.num_shards = num_shards or mp.cpu_count()
+        # entity name <-> id, used to aggregate bulk loads and merge shard rankings
+        self.entities = EntityDictionary()
+        self.conns = []
+        self.workers = []
+        for _ in range(self.num_shards):
+            parent_conn, child_conn = mp.Pipe()
+            worker = mp.Process(target=_shard_worker, args=(child_conn, maxn, max_dist), daemon=True)
+            worker.start()
+            child_conn.close()
+            self.conns.append(parent_conn)
+            self.workers.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stop all workers."""
+        for conn in self.conns:
+            conn.send(("close",))
+            conn.close()
+        for worker in self.workers:
+            worker.join()
+        self.conns, self.workers = [], []
+
+    def _shard(self, word):
+        return hash(word) % self.num_shards
+
+    def add(self, word, entity=""):
+        self.conns[self._shard(word)].send(("add", word, entity))
+
+    def build_from(self, pairs):
+        return self.build_from_counts((word, entity, 1) for word, entity in pairs)
+
+    def build_from_counts(self, triples):
+        """
+        Bulk-load an iterable of (word, entity, count) triples. Counts are summed
+        per word first, so each shard receives every (word, entity) once, and
+        shards build in parallel.
+        """
+        names = self.entities.names
+        shards = [[] for _ in range(self.num_shards)]
+        for word, counts in self.entities.aggregate(triples).items():
+            shard = shards[self._shard(word)]
+            for entity_id, count in counts.items():
+                shard.append((word, names[entity_id], count))
+        for conn, shard_triples in zip(self.conns, shards):
+            conn.send(("build", shard_triples))
+        self._collect()
+        return self
+
+    def _collect(self):
+        """Receive one reply per shard, re-raising a worker's error once all have answered."""
+        replies = [conn.recv() for conn in self.conns]
+        for status, value in replies:
+            if status == "error":
+                raise RuntimeError(f"shard worker failed:\n{value}")
+        return [value for _, value in replies]
+
+    def _fan_out(self, *request):
+        for conn in self.conns:
+            conn.send(request)
+        return self._collect()
+
+    def _merge(self, rankings):
+        totals = self.entities.new_totals()
+        get_id = self.entities.get_id
+        for ranking in rankings:
+            for entity, count in ranking:
+                entity_id = get_id(entity)
+                if entity_id >= len(totals):
+                    totals.extend([0] * (entity_id + 1 - len(totals)))
+                totals[entity_id] += count
+        return self.entities.rank(totals)
+
+    def get_similar_words(self, s, tol):
+        """Get list of similar words from every shard."""
+        results = []
+        for words in self._fan_out("words", s, tol):
+            results.extend(words)
+        return results
+
+    def get_entity_rank_by_similar_words(self, s, tol):
+        """Get ranked list of entities by frequency, merged across shards."""
+        return self._merge(self._fan_out("rank", s, tol))
+
+    def search_many(self, queries, tol):
+        """Rank entities for every query; each shard answers the whole batch at once."""
+        queries = list(queries)
+        per_shard = self._fan_out("rank_many", queries, tol)
+        return [self._merge(rankings) for rankings in zip(*per_shard)]
@@ -0,0 +1,160 @@
+from bisect import bisect_left
+from Levenshtein import distance as levenshtein_distance
+import numpy as np
+
+from data_structures.EntityDictionary import EntityDictionary
+
+class Sparse_Matrix_Index:
+    """
+    Word x entity count matrix in CSR form.
+
+    Rows are the vocabulary in sorted order, columns are entity ids, and row r's
+    nonzero counts are data[indptr[r]:indptr[r + 1]] at columns
+    indices[indptr[r]:indptr[r + 1]]. Every ranking is then a sum of rows done
+    in numpy: a prefix is one contiguous row range, a fuzzy match is a set of
+    rows gathered by fancy indexing, and top_k uses argpartition.
+
+    The matrix is rebuilt lazily: add() stages counts, which are folded in on
+    the next query, so bulk-load with build_from / build_from_counts.
+    """
+
+    def __init__(self, edit_distance=levenshtein_distance, entities=None):
+        self.edit_distance = edit_distance
+        self.entities = EntityDictionary.shared(entities)
+        self.words = []  # row -> word, sorted
+        self.word_lengths = np.zeros(0, dtype=np.int32)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.data = np.zeros(0, dtype=np.int64)
+        self.pending = {}  # word -> {entity id: count} not yet in the matrix
+
+    def add(self, word, entity="", count=1):
+        counts = self.pending.setdefault(word, {})
+        entity_id = self.entities.get_id(entity)
+        counts[entity_id] = counts.get(entity_id, 0) + count
+
+    def build_from(self, pairs):
+        return self.build_from_counts((word, entity, 1) for word, entity in pairs)
+
+    def build_from_counts(self, triples):
+        """
+        Bulk-load an iterable of (word, entity, count) triples,
+        e.g. from hashMapBaseline.iter_word_counts. The counts are only staged;
+        the matrix is built once, on the next query.
+        """
+        for word, entity, count in triples:
+            self.add(word, entity, count)
+        return self
+
+    def _compile(self):
+        """Fold staged counts and the current rows into a fresh CSR matrix."""
+        if not self.pending:
+            return
+        staged = self.pending
+        indices, data = self.indices.tolist(), self.data.tolist()
+        for row, word in enumerate(self.words):
+            counts = staged.setdefault(word, {})
+            for k in range(self.indptr[row], self.indptr[row + 1]):
+                counts[indices[k]] = counts.get(indices[k], 0) + data[k]
+
+        self.words = sorted(staged)
+        indptr, indices, data = [0], [], []
+        for word in self.words:
+            counts = staged[word]
+            for entity_id in sorted(counts):
+                indices.append(entity_id)
+                data.append(counts[entity_id])
+            indptr.append(len(indices))
+
+        self.word_lengths = np.array([len(word) for word in self.words], dtype=np.int32)
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int32)
+        self.data = np.array(data, dtype=np.int64)
+        self.pending = {}
+
+    def _row(self, word):
+        """Return the row of word, or -1."""
+        self._compile()
+        row = bisect_left(self.words, word)
+        return row if row < len(self.words) and self.words[row] == word else -1
+
+    def _prefix_rows(self, prefix):
+        """Return the [lo, hi) row range of words starting with prefix."""
+        self._compile()
+        words = self.words
+        if not prefix:
+            return 0, len(words)
+        # every word starting with prefix sorts before prefix with its last char bumped
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return bisect_left(words, prefix), bisect_left(words, upper)
+
+    def _similar_rows(self, s, tol):
+        """Return the rows within tol of s; only words of a close enough length are compared."""
+        self._compile()
+        words = self.words
+        candidates = np.flatnonzero(np.abs(self.word_lengths - len(s)) <= tol)
+        return np.array([row for row in candidates.tolist() if self.edit_distance(words[row], s) <= tol],
+                        dtype=np.int64)
+
+    def _sum_rows(self, rows):
+        """Dense per-entity totals over the given rows."""
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        # position of every stored count in the selected rows, in row order
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        return self._bincount(self.indices[positions], self.data[positions])
+
+    def _bincount(self, indices, data):
+        totals = np.bincount(indices, weights=data, minlength=len(self.entities))
+        return totals.astype(np.int64)
+
+    def _rank(self, totals, top_k=None):
+        """
+        Turn dense totals into (name, count) sorted by count descending, ties by id,
+        truncated to top_k if given.
+        """
+        ids = np.flatnonzero(totals)
+        if top_k is not None and top_k < len(ids):
+            values = totals[ids]
+            kth = values[np.argpartition(-values, top_k - 1)[top_k - 1]]
+            ids = ids[values >= kth]  # keeps ties at the cut so the id order decides them
+        order = ids[np.argsort(-totals[ids], kind="stable")][:top_k]
+        names = self.entities.names
+        return [(names[entity_id], int(totals[entity_id])) for entity_id in order.tolist()]
+
+    def get_airlines_for_word(self, word):
+        """
+        Return dict of airline -> count for an exact word.
+        """
+        row = self._row(word)
+        if row == -1:
+            return {}
+        lo, hi = self.indptr[row], self.indptr[row + 1]
+        names = self.entities.names
+        return {names[entity_id]: count
+                for entity_id, count in zip(self.indices[lo:hi].tolist(), self.data[lo:hi].tolist())}
+
+    def get_airline_ranking_for_prefix(self, prefix, top_k=None):
+        """
+        Sum the contiguous row range of words starting with prefix.
+        Return airlines ranked by frequency (only the first top_k if given).
+        """
+        lo, hi = self._prefix_rows(prefix)
+        start, end = self.indptr[lo], self.indptr[hi]
+        return self._rank(self._bincount(self.indices[start:end], self.data[start:end]), top_k)
+
+    def get_similar_words(self, s, tol):
+        """Get list of similar words."""
+        return [self.words[row] for row in self._similar_rows(s, tol).tolist()]
+
+    def get_entity_rank_by_similar_words(self, s, tol, top_k=None):
+        """Get ranked list of entities by frequency."""
+        return self._rank(self._sum_rows(self._similar_rows(s, tol)), top_k)
+
+    def get_entity_rank_for_words(self, words, top_k=None):
+        """
+        Rank entities over an explicit list of words, e.g. the candidates found by
+        another fuzzy index. Unknown words are ignored.
+        """
+        rows = np.array([row for row in map(self._row, dict.fromkeys(words)) if row != -1], dtype=np.int64)
+        return self._rank(self._sum_rows(rows), top_k)
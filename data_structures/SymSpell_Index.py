@@ -0,0 +1,66 @@
+from collections import defaultdict
+from Levenshtein import distance as levenshtein_distance
+
+from data_structures.EntityDictionary import EntityDictionary
+
+def _deletes(word, max_deletes):
+    """Return every string obtainable from word by deleting up to max_deletes characters."""
+    variants = {word}
+    level = {word}
+    for _ in range(max_deletes):
+        level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))}
+        variants |= level
+    return variants
+
+class SymSpell_Index:
+    """
+    Symmetric-delete fuzzy index (SymSpell).
+
+    Every vocabulary word is stored under each string reachable by deleting up to
+    max_tol of its characters. Two words within edit distance tol always share such
+    a deletion variant with at most tol deletions on each side, so a query only
+    looks up its own deletion variants and verifies the few candidates found.
+    Trades memory for lookups that do not walk a tree. Queries need tol <= max_tol.
+    """
+
+    def __init__(self, max_tol=2, edit_distance=levenshtein_distance, entities=None):
+        self.max_tol = max_tol
+        self.edit_distance = edit_distance
+        self.entities = EntityDictionary.shared(entities)
+        self.word_counts = {}  # word -> {entity id: count}
+        self.deletes = defaultdict(list)  # deletion variant -> original words
+
+    def _counts_for(self, word):
+        counts = self.word_counts.get(word)
+        if counts is None:
+            counts = self.word_counts[word] = defaultdict(int)
+            for variant in _deletes(word, self.max_tol):
+                self.deletes[variant].append(word)
+        return counts
+
+    def add(self, word, entity=""):
+        self._counts_for(word)[self.entities.get_id(entity)] += 1
+
+    def build_from(self, pairs):
+        get_id = self.entities.get_id
+        for word, entity in pairs:
+            self._counts_for(word)[get_id(entity)] += 1
+        return self
+
+    def get_similar_words(self, s, tol):
+        """Get list of similar words."""
+        if tol > self.max_tol:
+            raise ValueError(f"tol={tol} exceeds max_tol={self.max_tol} this index was built for")
+
+        candidates = set()
+        for variant in _deletes(s, tol):
+            candidates.update(self.deletes.get(variant, ()))
+        return [word for word in candidates
+                if abs(len(word) - len(s)) <= tol and self.edit_distance(word, s) <= tol]
+
+    def get_entity_rank_by_similar_words(self, s, tol):
+        """Get ranked list of entities by frequency."""
+        totals = self.entities.new_totals()
+        for word in self.get_similar_words(s, tol):
+            self.entities.add_counts(totals, self.word_counts[word])
+        return self.entities.rank(totals)
@@ -1,12 +1,21 @@
+import heapq
+from array import array
 from collections import defaultdict
 
+from data_structures.EntityDictionary import EntityDictionary
+
 class Node:
     def __init__(self):
         # 26 English lowercase letters (a–z)
         self.links = [None] * 26
         self.is_end_of_word = False
-        # airline_name → count of times this word appears for that airline in its comments
+        # airline id → count of times this word appears for that airline in its comments
         self.airline_counts = defaultdict(int)
+        # airline id → total count over every word in this node's subtree
+        self.subtree_counts = defaultdict(int)
+        # total count of this word over all airlines, and the largest such total in the subtree
+        self.word_count = 0
+        self.max_word_count = 0
 
     def contains_key(self, ch):
         return self.links[ord(ch) - ord('a')] is not None
@@ -25,22 +34,51 @@ class Node:
 
 
 class Trie:
-    def __init__(self):
+    def __init__(self, entities=None):
         self.root = Node()
+        self.entities = EntityDictionary.shared(entities)
 
-    def insert(self, word, airline_name):
+    def insert(self, word, airline_name, count=1):
         """
-        Insert a word and increment count for airline_name.
+        Insert a word and add count occurrences for airline_name.
+        Every node on the path also has its subtree total bumped.
         """
+        airline_id = self.entities.get_id(airline_name)
         node = self.root
+        node.subtree_counts[airline_id] += count
+        path = [node]
         for ch in word.lower():
             if not ('a' <= ch <= 'z'):
                 continue  # skip non-letter characters
             if not node.contains_key(ch):
                 node.put(ch, Node())
             node = node.get(ch)
+            node.subtree_counts[airline_id] += count
+            path.append(node)
         node.set_end()
-        node.airline_counts[airline_name] += 1  
+        node.airline_counts[airline_id] += count
+        node.word_count += count
+
+        # counts only grow, so the subtree maximum can be raised in place
+        for ancestor in path:
+            if ancestor.max_word_count < node.word_count:
+                ancestor.max_word_count = node.word_count
+
+    def build_from(self, pairs):
+        """
+        Bulk-load an iterable of (word, airline) pairs.
+        """
+        for word, airline_name in pairs:
+            self.insert(word, airline_name)
+        return self
+
+    def build_from_counts(self, triples):
+        """
+        Bulk-load an iterable of (word, airline, count) triples, one insert per triple.
+        """
+        for word, airline_name, count in triples:
+            self.insert(word, airline_name, count)
+        return self
 
     def _search_prefix(self, word):
         node = self.root
@@ -59,48 +97,241 @@ class Trie:
         """
         node = self._search_prefix(word)
         if node and node.is_end():
-            return dict(node.airline_counts)
+            return self.entities.decode(node.airline_counts)
         return {}
 
     def get_words_and_airlines_starting_with(self, prefix):
         """
         Return list of (word, {airline: count}) for all words starting with prefix.
         """
-        results = []
+        decode = self.entities.decode
+        return [(word, decode(airline_counts))
+                for word, airline_counts in self.iter_words_starting_with(prefix)]
+
+    def iter_words_starting_with(self, prefix):
+        """
+        Lazily yield (word, airline_counts) for all words starting with prefix,
+        in alphabetical order. Uses an explicit stack instead of recursion.
+        The yielded airline_counts is the node's live {airline id: count} mapping,
+        not a copy, so callers must not modify it; names are in self.entities.
+        """
         node = self._search_prefix(prefix)
         if node is None:
-            return results
+            return
 
-        self._dfs(node, list(prefix.lower()), results)
-        return results
+        stack = [(node, prefix.lower())]
+        while stack:
+            node, word = stack.pop()
+            if node.is_end():
+                yield word, node.airline_counts
+
+            # push in reverse so 'a' is popped first
+            for i in range(25, -1, -1):
+                child = node.links[i]
+                if child is not None:
+                    stack.append((child, word + chr(i + ord('a'))))
+
+    def _iter_words_within_distance(self, word, tol):
+        """
+        Yield (word, node) for every stored word within edit distance tol of word.
+        Each trie edge extends the parent's Levenshtein DP row by one letter, so
+        words sharing a prefix share that work, and a subtree is skipped once the
+        smallest value in its row exceeds tol.
+        """
+        word = "".join(ch for ch in word.lower() if 'a' <= ch <= 'z')
+        stack = [(self.root, "", list(range(len(word) + 1)))]
+        while stack:
+            node, path, row = stack.pop()
+            if node.is_end() and row[-1] <= tol:
+                yield path, node
 
-    def _dfs(self, node, path, results):
-        if node.is_end():
-            word = "".join(path)
-            results.append((word, dict(node.airline_counts)))
+            for i in range(25, -1, -1):
+                child = node.links[i]
+                if child is None:
+                    continue
+                ch = chr(i + ord('a'))
+                new_row = [row[0] + 1]
+                for j in range(1, len(word) + 1):
+                    new_row.append(min(
+                        new_row[j - 1] + 1,  # insertion
+                        row[j] + 1,  # deletion
+                        row[j - 1] + (word[j - 1] != ch)  # replacement
+                    ))
+                if min(new_row) <= tol:
+                    stack.append((child, path + ch, new_row))
 
-        for i in range(26):
-            if node.links[i] is not None:
-                path.append(chr(i + ord('a')))
-                self._dfs(node.links[i], path, results)
-                path.pop()
+    def get_words_within_distance(self, word, tol):
+        """
+        Return list of stored words within edit distance tol of word.
+        """
+        return [path for path, _ in self._iter_words_within_distance(word, tol)]
+
+    def get_entity_rank_by_similar_words(self, word, tol):
+        """
+        Aggregate airline counts over all words within edit distance tol of word.
+        Return airlines ranked by frequency, as the BK-trees do.
+        """
+        totals = self.entities.new_totals()
+        for _, node in self._iter_words_within_distance(word, tol):
+            self.entities.add_counts(totals, node.airline_counts)
+        return self.entities.rank(totals)
 
-    def get_airline_ranking_for_prefix(self, prefix):
+    def get_airline_ranking_for_prefix(self, prefix, top_k=None):
         """
         Aggregate total counts across all words starting with prefix.
-        Return airlines ranked by frequency.
+        Return airlines ranked by frequency (only the first top_k if given).
+        Uses the subtree totals kept on each node, so only the prefix is walked.
+        """
+        node = self._search_prefix(prefix)
+        if node is None:
+            return []
+
+        # sort descending by frequency (bounded heap when top_k is given)
+        return self.entities.rank(node.subtree_counts, top_k)
+
+    def get_top_k_completions(self, prefix, k):
+        """
+        Return the k most frequent words starting with prefix as (word, total_count).
+        Best-first search keyed by each subtree's max_word_count, so it stops as soon
+        as k words have been found that no unexplored subtree can beat.
+        """
+        node = self._search_prefix(prefix)
+        if node is None or k <= 0:
+            return []
+
+        results = []
+        # entries: (-priority, kind, word, node); kind 0 = finished word, 1 = subtree.
+        # Words sort ahead of subtrees with the same bound, and paths are unique,
+        # so nodes themselves are never compared.
+        heap = [(-node.max_word_count, 1, prefix.lower(), node)]
+        while heap and len(results) < k:
+            priority, kind, word, node = heapq.heappop(heap)
+            if kind == 0:
+                results.append((word, -priority))
+                continue
+            if node.is_end():
+                heapq.heappush(heap, (-node.word_count, 0, word, node))
+            for i in range(26):
+                child = node.links[i]
+                if child is not None:
+                    heapq.heappush(heap, (-child.max_word_count, 1, word + chr(i + ord('a')), child))
+        return results
+
+    def freeze(self):
+        """
+        Pack the trie into a read-only FrozenTrie.
         """
-        results = self.get_words_and_airlines_starting_with(prefix)
-        total_counts = defaultdict(int)
+        return FrozenTrie(self)
 
-        # aggregate counts across all matching words
-        for word, airline_counts in results:
-            for airline, count in airline_counts.items():
-                total_counts[airline] += count
 
-        # sort descending by frequency
-        ranked = sorted(total_counts.items(), key=lambda x: x[1], reverse=True)
-        return ranked
+class FrozenTrie:
+    """
+    Read-only trie packed into flat arrays.
+
+    Nodes are numbered in BFS order, so the children of a node are consecutive
+    ids and edge e always leads to node e + 1. Per node we only keep the offset
+    of its first edge; labels, end flags and counts live in contiguous arrays.
+    """
+
+    def __init__(self, trie):
+        # count tables reuse the trie's airline ids
+        self.entities = trie.entities
+
+        self.child_start = array('i')     # node -> first edge index
+        labels = bytearray()              # edge -> letter (sorted within a node)
+        self.is_end = bytearray()         # node -> 1 if a word ends here
+
+        # CSR tables: node -> (airline id, count) pairs
+        self.count_start = array('i', [0])
+        self.count_airline = array('i')
+        self.count_value = array('i')
+        self.subtree_start = array('i', [0])
+        self.subtree_airline = array('i')
+        self.subtree_value = array('i')
+
+        queue = [trie.root]
+        for node in queue:  # queue grows while iterating -> BFS order
+            self.child_start.append(len(labels))
+            self.is_end.append(1 if node.is_end() else 0)
+
+            for table, start, ids, values in (
+                (node.airline_counts, self.count_start, self.count_airline, self.count_value),
+                (node.subtree_counts, self.subtree_start, self.subtree_airline, self.subtree_value),
+            ):
+                for airline_id, count in table.items():
+                    ids.append(airline_id)
+                    values.append(count)
+                start.append(len(ids))
+
+            for i in range(26):
+                child = node.links[i]
+                if child is not None:
+                    labels.append(i + ord('a'))
+                    queue.append(child)
+        self.child_start.append(len(labels))
+        self.edge_labels = bytes(labels)
+
+    def __len__(self):
+        return len(self.is_end)
+
+    def _child(self, node, ch):
+        edge = self.edge_labels.find(ord(ch), self.child_start[node], self.child_start[node + 1])
+        return -1 if edge == -1 else edge + 1
+
+    def _search_prefix(self, word):
+        node = 0
+        for ch in word.lower():
+            if not ('a' <= ch <= 'z'):
+                continue
+            node = self._child(node, ch)
+            if node == -1:
+                return -1
+        return node
+
+    def _counts(self, node, start, ids, values):
+        names = self.entities.names
+        return {names[ids[i]]: values[i] for i in range(start[node], start[node + 1])}
+
+    def get_airlines_for_word(self, word):
+        """
+        Return dict of airline → count for an exact word.
+        """
+        node = self._search_prefix(word)
+        if node != -1 and self.is_end[node]:
+            return self._counts(node, self.count_start, self.count_airline, self.count_value)
+        return {}
+
+    def get_words_and_airlines_starting_with(self, prefix):
+        """
+        Return list of (word, {airline: count}) for all words starting with prefix.
+        """
+        results = []
+        node = self._search_prefix(prefix)
+        if node == -1:
+            return results
+
+        labels = self.edge_labels
+        # iterative DFS; children are pushed in reverse to keep alphabetical order
+        stack = [(node, prefix.lower())]
+        while stack:
+            node, word = stack.pop()
+            if self.is_end[node]:
+                results.append((word, self._counts(node, self.count_start, self.count_airline, self.count_value)))
+            for edge in range(self.child_start[node + 1] - 1, self.child_start[node] - 1, -1):
+                stack.append((edge + 1, word + chr(labels[edge])))
+        return results
+
+    def get_airline_ranking_for_prefix(self, prefix, top_k=None):
+        """
+        Return airlines ranked by total frequency across all words starting with prefix.
+        """
+        node = self._search_prefix(prefix)
+        if node == -1:
+            return []
+        totals = self.entities.new_totals()
+        for i in range(self.subtree_start[node], self.subtree_start[node + 1]):
+            totals[self.subtree_airline[i]] += self.subtree_value[i]
+        return self.entities.rank(totals, top_k)
 
 
 # ------------------- Example Usage -------------------
@@ -132,4 +363,8 @@ if __name__ == "__main__":
     print("\nAirline ranking for prefix 'del':")
     ranking = trie.get_airline_ranking_for_prefix("del")
     for airline, total in ranking:
-        print(f"{airline:15s} {total}")
\ No newline at end of file
+        print(f"{airline:15s} {total}")
+
+    print("\nTop 2 completions for prefix 'del':")
+    for word, total in trie.get_top_k_completions("del", 2):
+        print(f"{word:10s} {total}")
\ No newline at end of file
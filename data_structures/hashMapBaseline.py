@@ -1,22 +1,159 @@
+from bisect import bisect_left
 from collections import defaultdict
-import re, pandas as pd, time
+import heapq, pandas as pd, time
+from Levenshtein import distance as levenshtein_distance
 
+from data_structures.EntityDictionary import EntityDictionary
 
-def build_index(csv_path):
+
+class HashMapIndex:
+    """
+    HashMap index: word -> {airline id: count}.
+    Airline names are interned in an EntityDictionary shared with other indexes.
+    A sorted copy of the keys turns prefix lookups into a bisected range;
+    it is re-sorted lazily after new words are added.
+    """
+
+    def __init__(self, entities=None):
+        self.word_map = {}
+        self.entities = EntityDictionary.shared(entities)
+        self.sorted_words = []
+        self.sorted_stale = False
+
+    def add(self, word, airline_name, count=1):
+        airline_id = self.entities.get_id(airline_name)
+        counts = self.word_map.get(word)
+        if counts is None:
+            counts = self.word_map[word] = {}
+            self.sorted_stale = True
+        counts[airline_id] = counts.get(airline_id, 0) + count
+
+    def build_from(self, pairs):
+        """
+        Load an iterable of (word, airline) pairs.
+        """
+        return self.build_from_counts((word, airline, 1) for word, airline in pairs)
+
+    def build_from_counts(self, triples):
+        """
+        Load an iterable of (word, airline, count) triples, e.g. from iter_word_counts.
+        """
+        for word, airline, count in triples:
+            self.add(word, airline, count)
+        return self
+
+    def merge(self, other):
+        """
+        Add every count of another HashMapIndex into this one, matching airlines by name.
+        """
+        remap = [self.entities.get_id(name) for name in other.entities.names]
+        for word, their_counts in other.word_map.items():
+            counts = self.word_map.get(word)
+            if counts is None:
+                counts = self.word_map[word] = {}
+                self.sorted_stale = True
+            for airline_id, count in their_counts.items():
+                airline_id = remap[airline_id]
+                counts[airline_id] = counts.get(airline_id, 0) + count
+        return self
+
+    def _words_with_prefix(self, prefix):
+        """
+        Return the slice of sorted keys starting with prefix, found by bisection.
+        """
+        if self.sorted_stale:
+            self.sorted_words = sorted(self.word_map)
+            self.sorted_stale = False
+        words = self.sorted_words
+        if not prefix:
+            return words
+        # every key starting with prefix sorts before prefix with its last char bumped
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return words[bisect_left(words, prefix):bisect_left(words, upper)]
+
+    def get_airlines_for_word(self, word):
+        """
+        Return dict of airline -> count for an exact word.
+        """
+        return self.entities.decode(self.word_map.get(word, {}))
+
+    def get_airline_ranking_for_prefix(self, prefix, top_k=None):
+        """
+        Aggregate counts over every word starting with prefix.
+        Return airlines ranked by frequency (only the first top_k if given).
+        """
+        totals = self.entities.new_totals()
+        word_map = self.word_map
+        for w in self._words_with_prefix(prefix):
+            self.entities.add_counts(totals, word_map[w])
+        return self.entities.rank(totals, top_k)
+
+
+def count_word_airlines(df, airline_column="airline_name", content_column="content"):
+    """
+    Vectorised tokenize and count: pull the [a-z]+ tokens out of the lowercased
+    content column with pandas string ops, explode to one (word, airline) row per
+    token and count the pairs.
+    Returns a Series of counts indexed by (word, airline).
+    """
+    tokens = pd.DataFrame({
+        "word": df[content_column].map(str).str.lower().str.findall(r"[a-z]+"),
+        "airline": df[airline_column].map(str),
+    }).explode("word").dropna(subset=["word"])
+    return tokens.value_counts(["word", "airline"], sort=False)
+
+
+def iter_word_counts(df, airline_column="airline_name", content_column="content"):
+    """
+    Yield (word, airline, count) once per distinct word/airline pair in df.
+    Feeds HashMapIndex.build_from_counts, Trie.insert and the BK-trees' build_from_counts.
+    """
+    return iter_counts(count_word_airlines(df, airline_column, content_column))
+
+
+def iter_counts(counts):
+    """
+    Yield (word, airline, count) from a count_word_airlines Series.
     """
-    Build a HashMap index: word -> airline -> count
-    Returns the index and total build time.
+    return zip(counts.index.get_level_values("word").tolist(),
+               counts.index.get_level_values("airline").tolist(),
+               counts.tolist())
+
+
+def stream_build(csv_path, indexes, chunksize=10000, airline_column="airline_name", content_column="content"):
+    """
+    Feed every index in indexes from csv_path chunksize rows at a time, so memory
+    is bounded by one chunk plus the indexes rather than by the file. Each chunk is
+    counted once with iter_word_counts and handed to every index's build_from_counts.
+    Prints progress and rows/sec after each chunk; returns (rows, seconds).
     """
-    df = pd.read_csv(csv_path)
-    word_map = defaultdict(lambda: defaultdict(int))
+    rows = 0
+    start = time.perf_counter()
+    for chunk in pd.read_csv(csv_path, usecols=[airline_column, content_column], chunksize=chunksize):
+        counts = list(iter_word_counts(chunk, airline_column, content_column))
+        for index in indexes:
+            index.build_from_counts(counts)
+
+        rows += len(chunk)
+        elapsed = time.perf_counter() - start
+        print(f"📥 {rows} rows ingested ({rows / elapsed:.0f} rows/sec)")
+    return rows, time.perf_counter() - start
+
+
+def build_index(csv_path, chunksize=None):
+    """
+    Build a HashMapIndex: word -> airline -> count
+    With chunksize, the csv is streamed in that many rows at a time with
+    stream_build instead of being loaded whole.
+    Prints the build time and returns the index.
+    """
+    word_map = HashMapIndex()
 
     start = time.time()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            word_map[token][airline] += 1
+    if chunksize is None:
+        word_map.build_from_counts(iter_word_counts(pd.read_csv(csv_path)))
+    else:
+        stream_build(csv_path, [word_map], chunksize)
     end = time.time()
 
     print(f"✅ Indexed in {end - start:.2f} sec")
@@ -26,10 +163,15 @@ def build_index(csv_path):
 def lookup_exact_word(word_map, word):
     """
     Lookup airlines mentioning the exact word.
+    word_map is a HashMapIndex (or any index with the same API),
+    or a plain word -> airline -> count dict.
     Returns a dict of airline -> count and lookup time.
     """
     start = time.time()
-    result = dict(word_map.get(word, {}))
+    if hasattr(word_map, "get_airlines_for_word"):
+        result = word_map.get_airlines_for_word(word)
+    else:
+        result = dict(word_map.get(word, {}))
     end = time.time()
 
     print(f"\n🔍 Airlines mentioning '{word}':")
@@ -38,21 +180,29 @@ def lookup_exact_word(word_map, word):
     return result
 
 
-def lookup_prefix(word_map, prefix):
+def lookup_prefix(word_map, prefix, top_k=None):
     """
     Lookup all words starting with a prefix.
+    word_map is a HashMapIndex (or any index with the same API),
+    or a plain word -> airline -> count dict.
     Aggregate counts and rank airlines by total frequency.
-    Returns sorted list of (airline, total_count).
+    Returns sorted list of (airline, total_count), truncated to top_k if given.
     """
     start = time.time()
-    agg_counts = defaultdict(int)
+    if hasattr(word_map, "get_airline_ranking_for_prefix"):
+        ranked = word_map.get_airline_ranking_for_prefix(prefix, top_k)
+    else:
+        agg_counts = defaultdict(int)
 
-    for w, airlines in word_map.items():
-        if w.startswith(prefix):
-            for airline, cnt in airlines.items():
-                agg_counts[airline] += cnt
+        for w, airlines in word_map.items():
+            if w.startswith(prefix):
+                for airline, cnt in airlines.items():
+                    agg_counts[airline] += cnt
 
-    ranked = sorted(agg_counts.items(), key=lambda x: x[1], reverse=True)
+        if top_k is not None:
+            ranked = heapq.nlargest(top_k, agg_counts.items(), key=lambda x: x[1])
+        else:
+            ranked = sorted(agg_counts.items(), key=lambda x: x[1], reverse=True)
     end = time.time()
 
     print(f"\n🔡 Airlines ranked (hash map) for prefix '{prefix}':")
@@ -63,6 +213,35 @@ def lookup_prefix(word_map, prefix):
     return ranked
 
 
+def lookup_similar_words(word_map, word, tol=2, top_k=None):
+    """
+    Lookup all words within edit distance tol of word.
+    word_map is any index with get_entity_rank_by_similar_words (a BK-tree,
+    Sparse_Matrix_Index, ...), or a plain word -> airline -> count dict.
+    Returns sorted list of (airline, total_count), truncated to top_k if given.
+    """
+    start = time.time()
+    if hasattr(word_map, "get_entity_rank_by_similar_words"):
+        ranked = word_map.get_entity_rank_by_similar_words(word, tol)[:top_k]
+    else:
+        agg_counts = defaultdict(int)
+
+        for w, airlines in word_map.items():
+            if levenshtein_distance(w, word) <= tol:
+                for airline, cnt in airlines.items():
+                    agg_counts[airline] += cnt
+
+        ranked = sorted(agg_counts.items(), key=lambda x: x[1], reverse=True)[:top_k]
+    end = time.time()
+
+    print(f"\n🔎 Airlines ranked for words within {tol} edits of '{word}':")
+    for airline, total in ranked[:20]:
+        print(f"{airline:25s} {total}")
+    print(f"Fuzzy lookup took {end - start:.6f} sec")
+
+    return ranked
+
+
 # ------------------- Example Usage -------------------
 if __name__ == "__main__":
     # Step 1: Build index
@@ -73,3 +252,10 @@ if __name__ == "__main__":
 
     # Step 3: Prefix lookup
     lookup_prefix(word_map, "del")
+
+    # Step 4: Same lookups on the CSR matrix index, plus a fuzzy lookup
+    from data_structures.Sparse_Matrix_Index import Sparse_Matrix_Index
+    sparse_index = Sparse_Matrix_Index().build_from_counts(iter_word_counts(pd.read_csv("datasets/airline.csv")))
+    lookup_exact_word(sparse_index, "delay")
+    lookup_prefix(sparse_index, "del", top_k=5)
+    lookup_similar_words(sparse_index, "delay", 2)
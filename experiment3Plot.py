@@ -1,58 +1,39 @@
-import re, time, pandas as pd, matplotlib.pyplot as plt
-from collections import defaultdict
+import time, matplotlib.pyplot as plt
 from data_structures.Trie import Trie   # import your Trie class here (or paste above)
 from data_structures.hashMapBaseline import *
+from corpus import Corpus
 from pympler import asizeof
 
 
 # ---------------- HashMap Functions ----------------
-def build_hashmap(df):
-    word_map = defaultdict(lambda: defaultdict(int))
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            word_map[token][airline] += 1
+def build_hashmap(corpus):
+    word_map = HashMapIndex()
+    word_map.build_from_counts(corpus.iter_word_counts())
     return word_map, asizeof.asizeof(word_map)
 
 
 # ---------------- Trie Functions ----------------
-def build_trie(df):
+def build_trie(corpus):
     trie = Trie()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            trie.insert(token, airline)
+    for word, airline, count in corpus.iter_word_counts():
+        trie.insert(word, airline, count)
     return trie, asizeof.asizeof(trie)
 
 def prefix_search_experiment(csv_path, prefixes=["del", "serv", "clean"], sample_sizes=[1000, 5000, 10000, 20000]):
-    df = pd.read_csv(csv_path)
+    corpus = Corpus.from_csv(csv_path)
     hash_times = []
     trie_times = []
     word_counts = []
 
     for n in sample_sizes:
-        subset = df.sample(min(n, len(df)), random_state=42)
-        words = []
-        for _, row in subset.iterrows():
-            content = str(row["content"]).lower()
-            words += re.findall(r"[a-z]+", content)
-        word_counts.append(len(set(words)))
+        subset = corpus.sample(min(n, len(corpus)), random_state=42)
+        word_counts.append(subset.vocabulary_size())
 
         # Build HashMap
         word_map, _ = build_hashmap(subset)
 
         # Build Trie
-        trie = Trie()
-        for _, row in subset.iterrows():
-            airline = str(row["airline_name"])
-            content = str(row["content"]).lower()
-            tokens = re.findall(r"[a-z]+", content)
-            for token in tokens:
-                trie.insert(token, airline)
+        trie, _ = build_trie(subset)
 
         # Measure HashMap prefix search
         start = time.perf_counter()
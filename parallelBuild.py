@@ -0,0 +1,67 @@
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from data_structures.Trie import Trie
+from data_structures.hashMapBaseline import HashMapIndex, count_word_airlines, iter_counts, iter_word_counts
+
+# index kind -> class with build_from_counts
+BUILDERS = {
+    "hashmap": HashMapIndex,
+    "trie": Trie,
+}
+
+
+def _build_part(chunk):
+    """Worker: tokenize one slice of rows and build a partial HashMapIndex from it."""
+    return HashMapIndex().build_from_counts(iter_word_counts(chunk))
+
+
+def parallel_build(df, kind="trie", num_workers=None):
+    """
+    Build a HashMapIndex or Trie from df across num_workers processes.
+    The rows are split into one contiguous slice per worker and each worker
+    tokenizes its slice.
+    - hashmap: workers build partial indexes, merged here with merge()
+    - trie: workers return their (word, airline) counts, which are summed here
+      and inserted into one Trie; a trie is slow to pickle and merge node by node
+    """
+    num_workers = num_workers or mp.cpu_count()
+    df = df[["airline_name", "content"]]
+    if num_workers == 1:
+        return BUILDERS[kind]().build_from_counts(iter_word_counts(df))
+
+    bounds = np.linspace(0, len(df), num_workers + 1).astype(int)
+    chunks = [df.iloc[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+    with mp.Pool(num_workers) as pool:
+        if kind == "trie":
+            parts = pool.map(count_word_airlines, chunks)
+        else:
+            parts = pool.map(_build_part, chunks)
+
+    if kind == "trie":
+        counts = pd.concat(parts).groupby(level=["word", "airline"], sort=False).sum()
+        return Trie().build_from_counts(iter_counts(counts))
+
+    index = parts[0]
+    for part in parts[1:]:
+        index.merge(part)
+    return index
+
+
+CSV_PATH = "./datasets/airline.csv"
+WORKER_COUNTS = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+
+if __name__ == "__main__":
+    df = pd.read_csv(CSV_PATH)
+
+    for kind in BUILDERS:
+        base = None
+        for workers in WORKER_COUNTS:
+            start = time.perf_counter()
+            parallel_build(df, kind, workers)
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(f"{kind:8s} {workers:2d} workers: {elapsed:.2f} sec ({base / elapsed:.2f}x)")
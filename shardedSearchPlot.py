@@ -0,0 +1,73 @@
+from datetime import datetime
+import os
+import time
+import random
+import matplotlib.pyplot as plt
+
+from data_structures.Sharded_BKTree import Sharded_BKTree
+from utils import *
+from corpus import Corpus
+
+def test_throughput_against_cores(pairs, core_counts, tols, queries):
+    """
+    For each number of cores, build a Sharded_BKTree with that many workers once,
+    then measure fuzzy queries per second for every tolerance in tols.
+    """
+    throughputs = {tol: [] for tol in tols}
+
+    for cores in core_counts:
+        with Sharded_BKTree(num_shards=cores, maxn=MAXN, max_dist=MAX_DIST) as index:
+            index.build_from(pairs)
+
+            for tol in tols:
+                start = time.perf_counter()
+                for query in queries:
+                    index.get_entity_rank_by_similar_words(query, tol)
+                end = time.perf_counter()
+                throughputs[tol].append(len(queries) / (end - start))
+
+        print(f"✅ Completed {cores} cores")
+
+    return throughputs
+
+
+def plot_result(core_counts, throughputs):
+    for tol, values in throughputs.items():
+        plt.plot(core_counts, values, 'o-', label=f'Tolerance {tol}')
+    plt.xlabel('Cores (worker processes)')
+    plt.ylabel('Throughput (queries/s)')
+    plt.title('Sharded BK Tree Fuzzy Search Throughput vs Cores')
+    plt.legend()
+    plt.grid(True)
+
+    plt.tight_layout()
+    plt.savefig(f"{FIGURE_PATH}/sharded_search_results_{datetime.now().strftime(DATE_FORMAT)}.png")
+    plt.show()
+
+# Array BK Tree configs (one tree per worker)
+MAXN = 1
+MAX_DIST = 50
+TOLS = [2, 3, 4]
+
+# Configs for file paths and date output format
+FIGURE_PATH = "./figs"
+DATE_FORMAT = "%Y-%m-%d_%H-%M-%S"
+CSV_PATH = "./datasets/airline.csv"
+
+NUM_QUERIES = 50
+CORE_COUNTS = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+
+random.seed(123)
+
+if __name__ == "__main__":
+    create_folder(FIGURE_PATH)
+    corpus = Corpus.from_csv(CSV_PATH)
+    pairs = list(corpus.iter_token_pairs())
+    queries = random.sample(sorted(corpus.vocab), NUM_QUERIES)
+
+    throughputs = test_throughput_against_cores(pairs, CORE_COUNTS, TOLS, queries)
+
+    print("\nGenerating plot...")
+    plot_result(CORE_COUNTS, throughputs)
+
+    print(f"\nExperiments on sharded BK tree completed. You may find result figures in {FIGURE_PATH}")
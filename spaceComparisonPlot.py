@@ -1,82 +1,100 @@
-import re, time, pandas as pd, matplotlib.pyplot as plt
-from collections import defaultdict
+import time, matplotlib.pyplot as plt
 from data_structures.Trie import Trie   # import your Trie class here (or paste above)
+from data_structures.Radix_Trie import Radix_Trie
 from data_structures.Array_BKTree import Array_BKTree
 from data_structures.Linked_BKTree import Linked_BKTree
+from data_structures.Columnar_BKTree import Columnar_BKTree
+from data_structures.SymSpell_Index import SymSpell_Index
+from data_structures.hashMapBaseline import HashMapIndex
+from corpus import Corpus
 from pympler import asizeof
 
 
 # ---------------- HashMap Functions ----------------
-def build_hashmap(df):
-    word_map = defaultdict(lambda: defaultdict(int))
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            word_map[token][airline] += 1
+def build_hashmap(corpus):
+    word_map = HashMapIndex()
+    word_map.build_from_counts(corpus.iter_word_counts())
     return word_map, asizeof.asizeof(word_map)
 
 
 # ---------------- Trie Functions ----------------
-def build_trie(df):
+def build_trie(corpus):
     trie = Trie()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            trie.insert(token, airline)
+    for word, airline, count in corpus.iter_word_counts():
+        trie.insert(word, airline, count)
     return trie, asizeof.asizeof(trie)
 
 
+def build_frozen_trie(trie):
+    frozen_trie = trie.freeze()
+    return frozen_trie, asizeof.asizeof(frozen_trie)
+
+
+# ---------------- Radix Trie Functions ----------------
+def build_radix_trie(corpus):
+    radix_trie = Radix_Trie()
+    for word, airline, count in corpus.iter_word_counts():
+        radix_trie.insert(word, airline, count)
+    return radix_trie, asizeof.asizeof(radix_trie)
+
+
 # ---------------- Linked BK-Tree Functions ----------------
-def build_linked_bk(df):
+def build_linked_bk(corpus):
     linked_bk_tree = Linked_BKTree()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            linked_bk_tree.add(token, airline)
+    linked_bk_tree.build_from_counts(corpus.iter_word_counts())
     return linked_bk_tree, asizeof.asizeof(linked_bk_tree)
 
 
 # ---------------- Array BK-Tree Functions ----------------
-def build_array_bk(df):
+def build_array_bk(corpus):
     array_bk_tree = Array_BKTree()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            array_bk_tree.add(token, airline)
+    array_bk_tree.build_from_counts(corpus.iter_word_counts())
     return array_bk_tree, asizeof.asizeof(array_bk_tree)
 
 
+# ---------------- Columnar BK-Tree Functions ----------------
+def build_columnar_bk(corpus):
+    columnar_bk_tree = Columnar_BKTree()
+    columnar_bk_tree.build_from_counts(corpus.iter_word_counts()).compact()
+    return columnar_bk_tree, asizeof.asizeof(columnar_bk_tree)
+
+
+# ---------------- SymSpell Functions ----------------
+def build_symspell(corpus):
+    symspell_index = SymSpell_Index()
+    symspell_index.build_from(corpus.iter_token_pairs())
+    return symspell_index, asizeof.asizeof(symspell_index)
+
+
 # ---------------- Experiment Runner ----------------
 def run_experiment(csv_path, sample_sizes=[1000, 5000, 10000, 20000]):
-    df = pd.read_csv(csv_path)
+    corpus = Corpus.from_csv(csv_path)
     word_counts = []
     hash_size, trie_size, linked_bk_size, array_bk_size = [], [], [], []
+    frozen_trie_size, radix_trie_size, columnar_bk_size = [], [], []
+    symspell_size = []
 
     for n in sample_sizes:
-        subset = df.sample(n, random_state=42)
+        subset = corpus.sample(n, random_state=42)
         
-        words = []
-        for _, row in subset.iterrows():
-            content = str(row["content"]).lower()
-            words += re.findall(r"[a-z]+", content)
-        word_counts.append(len(set(words)))
+        word_counts.append(subset.vocabulary_size())
 
         # Build HashMap
         _, h_size = build_hashmap(subset)
         hash_size.append(h_size)
 
         # Build Trie
-        _, t_size = build_trie(subset)
+        trie, t_size = build_trie(subset)
         trie_size.append(t_size)
 
+        # Freeze Trie
+        _, f_size = build_frozen_trie(trie)
+        frozen_trie_size.append(f_size)
+
+        # Build Radix Trie
+        _, r_size = build_radix_trie(subset)
+        radix_trie_size.append(r_size)
+
         # Build Linked BK-Tree
         _, linked_size = build_linked_bk(subset)
         linked_bk_size.append(linked_size)
@@ -85,20 +103,32 @@ def run_experiment(csv_path, sample_sizes=[1000, 5000, 10000, 20000]):
         _, array_size = build_array_bk(subset)
         array_bk_size.append(array_size)
 
+        # Build Columnar BK-Tree
+        _, columnar_size = build_columnar_bk(subset)
+        columnar_bk_size.append(columnar_size)
+
+        # Build SymSpell index
+        _, sym_size = build_symspell(subset)
+        symspell_size.append(sym_size)
+
         print(f"✅ Completed {n} reviews")
 
-    return word_counts, (hash_size, trie_size, linked_bk_size, array_bk_size)
+    return word_counts, (hash_size, trie_size, linked_bk_size, array_bk_size, frozen_trie_size, radix_trie_size, columnar_bk_size, symspell_size)
 
 
 # ---------------- Plotting ----------------
-def plot_results(saved_fig_path, word_counts, hash_size, trie_size, linked_bk_size, array_bk_size):
+def plot_results(saved_fig_path, word_counts, hash_size, trie_size, linked_bk_size, array_bk_size, frozen_trie_size, radix_trie_size, columnar_bk_size, symspell_size):
     plt.figure(figsize=(14, 10))
 
     # Build time
     plt.plot(word_counts, hash_size, 'o-', label="HashMap")
     plt.plot(word_counts, trie_size, 'o-', label="Trie")
+    plt.plot(word_counts, frozen_trie_size, 'o-', label="Frozen Trie")
+    plt.plot(word_counts, radix_trie_size, 'o-', label="Radix Trie")
     plt.plot(word_counts, linked_bk_size, 'o-', label="Linked BK Tree")
     plt.plot(word_counts, array_bk_size, 'o-', label="Array BK Tree")
+    plt.plot(word_counts, columnar_bk_size, 'o-', label="Columnar BK Tree")
+    plt.plot(word_counts, symspell_size, 'o-', label="SymSpell")
     plt.title("Space Taken vs Input Size")
     plt.xlabel("Number of unique words")
     plt.ylabel("Space Taken (Bytes)")
@@ -138,8 +168,9 @@ if __name__ == "__main__":
 
     # Unpack averaged results
     (
-        hash_size, trie_size, linked_bk_size, array_bk_size
+        hash_size, trie_size, linked_bk_size, array_bk_size, frozen_trie_size, radix_trie_size,
+        columnar_bk_size, symspell_size
     ) = avg_results
 
     # Plot the averaged results
-    plot_results(saved_fig_path, word_counts, hash_size, trie_size, linked_bk_size, array_bk_size)
\ No newline at end of file
+    plot_results(saved_fig_path, word_counts, hash_size, trie_size, linked_bk_size, array_bk_size, frozen_trie_size, radix_trie_size, columnar_bk_size, symspell_size)
\ No newline at end of file
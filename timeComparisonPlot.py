@@ -1,49 +1,40 @@
-import re, time, pandas as pd, matplotlib.pyplot as plt
-from collections import defaultdict
+import time, matplotlib.pyplot as plt
 from data_structures.Trie import Trie   # import your Trie class here (or paste above)
+from data_structures.Radix_Trie import Radix_Trie
 from data_structures.Array_BKTree import Array_BKTree
 from data_structures.Linked_BKTree import Linked_BKTree
+from data_structures.QGram_Index import QGram_Index
+from data_structures.Sparse_Matrix_Index import Sparse_Matrix_Index
+from data_structures.hashMapBaseline import HashMapIndex
+from corpus import Corpus
 
 
 # ---------------- HashMap Functions ----------------
-def build_hashmap(df):
-    word_map = defaultdict(lambda: defaultdict(int))
+def build_hashmap(corpus):
+    word_map = HashMapIndex()
     start = time.perf_counter()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            word_map[token][airline] += 1
+    word_map.build_from_counts(corpus.iter_word_counts())
     return word_map, time.perf_counter() - start
 
 
 def hashmap_exact(word_map, word):
     start = time.perf_counter()
-    _ = dict(word_map.get(word, {}))
+    _ = word_map.get_airlines_for_word(word)
     return time.perf_counter() - start
 
 
 def hashmap_prefix(word_map, prefix):
     start = time.perf_counter()
-    agg_counts = defaultdict(int)
-    for w, airlines in word_map.items():
-        if w.startswith(prefix):
-            for a, c in airlines.items():
-                agg_counts[a] += c
+    _ = word_map.get_airline_ranking_for_prefix(prefix)
     return time.perf_counter() - start
 
 
 # ---------------- Trie Functions ----------------
-def build_trie(df):
+def build_trie(corpus):
     trie = Trie()
     start = time.perf_counter()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            trie.insert(token, airline)
+    for word, airline, count in corpus.iter_word_counts():
+        trie.insert(word, airline, count)
     return trie, time.perf_counter() - start
 
 
@@ -59,16 +50,20 @@ def trie_prefix(trie, prefix):
     return time.perf_counter() - start
 
 
+# ---------------- Radix Trie Functions ----------------
+def build_radix_trie(corpus):
+    radix_trie = Radix_Trie()
+    start = time.perf_counter()
+    for word, airline, count in corpus.iter_word_counts():
+        radix_trie.insert(word, airline, count)
+    return radix_trie, time.perf_counter() - start
+
+
 # ---------------- Linked BK-Tree Functions ----------------
-def build_linked_bk(df):
+def build_linked_bk(corpus):
     linked_bk_tree = Linked_BKTree()
     start = time.perf_counter()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            linked_bk_tree.add(token, airline)
+    linked_bk_tree.build_from_counts(corpus.iter_word_counts())
     return linked_bk_tree, time.perf_counter() - start
 
 
@@ -79,15 +74,10 @@ def linked_bk_search(linked_bk_tree, word, tol):
 
 
 # ---------------- Array BK-Tree Functions ----------------
-def build_array_bk(df):
+def build_array_bk(corpus):
     array_bk_tree = Array_BKTree()
     start = time.perf_counter()
-    for _, row in df.iterrows():
-        airline = str(row["airline_name"])
-        content = str(row["content"]).lower()
-        tokens = re.findall(r"[a-z]+", content)
-        for token in tokens:
-            array_bk_tree.add(token, airline)
+    array_bk_tree.build_from_counts(corpus.iter_word_counts())
     return array_bk_tree, time.perf_counter() - start
 
 
@@ -97,9 +87,37 @@ def array_bk_search(array_bk_tree, word, tol):
     return time.perf_counter() - start
 
 
+# ---------------- q-gram Index Functions ----------------
+def build_qgram(corpus):
+    qgram_index = QGram_Index()
+    start = time.perf_counter()
+    qgram_index.build_from(corpus.iter_token_pairs())
+    return qgram_index, time.perf_counter() - start
+
+
+def qgram_search(qgram_index, word, tol):
+    start = time.perf_counter()
+    _ = qgram_index.get_entity_rank_by_similar_words(word, tol)
+    return time.perf_counter() - start
+
+
+# ---------------- Sparse Matrix Index Functions ----------------
+def build_sparse_matrix(corpus):
+    sparse_index = Sparse_Matrix_Index()
+    start = time.perf_counter()
+    sparse_index.build_from_counts(corpus.iter_word_counts())
+    return sparse_index, time.perf_counter() - start
+
+
+def sparse_matrix_search(sparse_index, word, tol):
+    start = time.perf_counter()
+    _ = sparse_index.get_entity_rank_by_similar_words(word, tol)
+    return time.perf_counter() - start
+
+
 # ---------------- Experiment Runner ----------------
 def run_experiment(csv_path, word="delay", prefix="del", sample_sizes=[1000, 5000, 10000, 20000]):
-    df = pd.read_csv(csv_path)
+    corpus = Corpus.from_csv(csv_path)
     word_counts = []
     hash_insert, trie_insert = [], []
     hash_exact, trie_exact_t = [], []
@@ -107,15 +125,14 @@ def run_experiment(csv_path, word="delay", prefix="del", sample_sizes=[1000, 500
     linked_bk_insert, array_bk_insert = [], []
     linked_bk_search_t, array_bk_search_t = [], []
     linked_bk_exact_t, array_bk_exact_t = [], []
+    radix_insert, radix_exact_t, radix_prefix_t = [], [], []
+    qgram_insert, qgram_search_t = [], []
+    sparse_insert, sparse_exact_t, sparse_prefix_t, sparse_search_t = [], [], [], []
 
     for n in sample_sizes:
-        subset = df.sample(n, random_state=42)
+        subset = corpus.sample(n, random_state=42)
         
-        words = []
-        for _, row in subset.iterrows():
-            content = str(row["content"]).lower()
-            words += re.findall(r"[a-z]+", content)
-        word_counts.append(len(set(words)))
+        word_counts.append(subset.vocabulary_size())
 
         # Build HashMap
         word_map, t_build_h = build_hashmap(subset)
@@ -129,6 +146,12 @@ def run_experiment(csv_path, word="delay", prefix="del", sample_sizes=[1000, 500
         trie_exact_t.append(trie_exact(trie, word))
         trie_prefix_t.append(trie_prefix(trie, prefix))
 
+        # Build Radix Trie (same query API as Trie)
+        radix_trie, t_build_r = build_radix_trie(subset)
+        radix_insert.append(t_build_r)
+        radix_exact_t.append(trie_exact(radix_trie, word))
+        radix_prefix_t.append(trie_prefix(radix_trie, prefix))
+
         # Build Linked BK-Tree
         linked_bk_tree, linked_build_t = build_linked_bk(subset)
         linked_bk_insert.append(linked_build_t)
@@ -141,25 +164,41 @@ def run_experiment(csv_path, word="delay", prefix="del", sample_sizes=[1000, 500
         array_bk_exact_t.append(array_bk_search(array_bk_tree, word, 0))
         array_bk_search_t.append(array_bk_search(array_bk_tree, word, 2))
 
+        # Build q-gram Index
+        qgram_index, qgram_build_t = build_qgram(subset)
+        qgram_insert.append(qgram_build_t)
+        qgram_search_t.append(qgram_search(qgram_index, word, 2))
+
+        # Build Sparse Matrix Index (same exact/prefix API as HashMapIndex)
+        sparse_index, sparse_build_t = build_sparse_matrix(subset)
+        sparse_insert.append(sparse_build_t)
+        sparse_exact_t.append(hashmap_exact(sparse_index, word))
+        sparse_prefix_t.append(hashmap_prefix(sparse_index, prefix))
+        sparse_search_t.append(sparse_matrix_search(sparse_index, word, 2))
+
         print(f"✅ Completed {n} reviews")
 
     return word_counts, (
         hash_insert, trie_insert, hash_exact, trie_exact_t, hash_prefix, trie_prefix_t,
         linked_bk_insert, array_bk_insert, linked_bk_exact_t, array_bk_exact_t, linked_bk_search_t,
-        array_bk_search_t
+        array_bk_search_t, radix_insert, radix_exact_t, radix_prefix_t, qgram_insert, qgram_search_t,
+        sparse_insert, sparse_exact_t, sparse_prefix_t, sparse_search_t
     )
 
 
 # ---------------- Plotting ----------------
-def plot_results(saved_fig_path, word_counts, hash_insert, trie_insert, hash_exact, trie_exact_t, hash_prefix, trie_prefix_t, linked_bk_insert, array_bk_insert, linked_bk_exact_t, array_bk_exact_t, linked_bk_search_t, array_bk_search_t):
+def plot_results(saved_fig_path, word_counts, hash_insert, trie_insert, hash_exact, trie_exact_t, hash_prefix, trie_prefix_t, linked_bk_insert, array_bk_insert, linked_bk_exact_t, array_bk_exact_t, linked_bk_search_t, array_bk_search_t, radix_insert, radix_exact_t, radix_prefix_t, qgram_insert, qgram_search_t, sparse_insert, sparse_exact_t, sparse_prefix_t, sparse_search_t):
     plt.figure(figsize=(14, 10))
 
     # Build time
     plt.subplot(2, 2, 1)
     plt.plot(word_counts, hash_insert, 'o-', label="HashMap")
     plt.plot(word_counts, trie_insert, 'o-', label="Trie")
+    plt.plot(word_counts, radix_insert, 'o-', label="Radix Trie")
     plt.plot(word_counts, linked_bk_insert, 'o-', label="Linked BK Tree")
     plt.plot(word_counts, array_bk_insert, 'o-', label="Array BK Tree")
+    plt.plot(word_counts, qgram_insert, 'o-', label="q-gram Index")
+    plt.plot(word_counts, sparse_insert, 'o-', label="Sparse Matrix")
     plt.title("Insertion Time vs Input Size")
     plt.xlabel("Number of unique words")
     plt.ylabel("Time (s)")
@@ -169,8 +208,10 @@ def plot_results(saved_fig_path, word_counts, hash_insert, trie_insert, hash_exa
     plt.subplot(2, 2, 2)
     plt.plot(word_counts, hash_exact, 'o-', label="HashMap")
     plt.plot(word_counts, trie_exact_t, 'o-', label="Trie")
+    plt.plot(word_counts, radix_exact_t, 'o-', label="Radix Trie")
     plt.plot(word_counts, linked_bk_exact_t, 'o-', label="Linked BK Tree")
     plt.plot(word_counts, array_bk_exact_t, 'o-', label="Array BK Tree")
+    plt.plot(word_counts, sparse_exact_t, 'o-', label="Sparse Matrix")
     plt.title("Exact Lookup Time vs Input Size")
     plt.xlabel("Number of unique words")
     plt.ylabel("Time (s)")
@@ -180,6 +221,8 @@ def plot_results(saved_fig_path, word_counts, hash_insert, trie_insert, hash_exa
     plt.subplot(2, 2, 3)
     plt.plot(word_counts, hash_prefix, 'o-', label="HashMap")
     plt.plot(word_counts, trie_prefix_t, 'o-', label="Trie")
+    plt.plot(word_counts, radix_prefix_t, 'o-', label="Radix Trie")
+    plt.plot(word_counts, sparse_prefix_t, 'o-', label="Sparse Matrix")
     plt.title("Prefix Lookup Time vs Input Size")
     plt.xlabel("Number of unique words")
     plt.ylabel("Time (s)")
@@ -189,6 +232,8 @@ def plot_results(saved_fig_path, word_counts, hash_insert, trie_insert, hash_exa
     plt.subplot(2, 2, 4)
     plt.plot(word_counts, linked_bk_search_t, 'o-', label="Linked BK Tree")
     plt.plot(word_counts, array_bk_search_t, 'o-', label="Array BK Tree")
+    plt.plot(word_counts, qgram_search_t, 'o-', label="q-gram Index")
+    plt.plot(word_counts, sparse_search_t, 'o-', label="Sparse Matrix")
     plt.title("Fuzzy Lookup Time vs Input Size")
     plt.xlabel("Number of unique words")
     plt.ylabel("Time (s)")
@@ -230,8 +275,10 @@ if __name__ == "__main__":
     # Unpack averaged results
     (
         h_i, t_i, h_e, t_e, h_p, t_p,
-        l_bk_i, a_bk_i, l_bk_e, a_bk_e, l_bk_s, a_bk_s
+        l_bk_i, a_bk_i, l_bk_e, a_bk_e, l_bk_s, a_bk_s,
+        r_i, r_e, r_p, q_i, q_s,
+        s_i, s_e, s_p, s_s
     ) = avg_results
 
     # Plot the averaged results
-    plot_results(saved_fig_path, word_counts, h_i, t_i, h_e, t_e, h_p, t_p, l_bk_i, a_bk_i, l_bk_e, a_bk_e, l_bk_s, a_bk_s)
\ No newline at end of file
+    plot_results(saved_fig_path, word_counts, h_i, t_i, h_e, t_e, h_p, t_p, l_bk_i, a_bk_i, l_bk_e, a_bk_e, l_bk_s, a_bk_s, r_i, r_e, r_p, q_i, q_s, s_i, s_e, s_p, s_s)
\ No newline at end of file
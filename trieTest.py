@@ -35,14 +35,14 @@ print("\n🔍 Query performance:")
 
 for prefix in prefixes:
     start = time.time()
-    ranking = trie.get_airline_ranking_for_prefix(prefix)
+    ranking = trie.get_airline_ranking_for_prefix(prefix, top_k=10)
     end = time.time()
     query_time = end - start
 
     print(f"\nPrefix '{prefix}' → Top 10 airlines (time: {query_time:.6f} sec)")
     print("-" * 50)
 
-    for i, (airline, total) in enumerate(ranking[:10], start=1):
+    for i, (airline, total) in enumerate(ranking, start=1):
         print(f"{i:2d}. {airline:25s} {total}")
 
     print("-" * 50)
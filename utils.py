@@ -1,28 +1,56 @@
 import csv
 import re
 import os
+from functools import partial
 
-def default_edit_distance(a, b):
+# char -> bitmask of its positions in the pattern; cleared and refilled per call
+_PEQ = {}
+
+def default_edit_distance(a, b, max_dist=None):
+    """Levenshtein distance via Myers/Hyyrö bit-parallel DP: one column per character of
+    the longer string, with the shorter string's DP column packed into two int bitmasks.
+    If max_dist is given, returns max_dist + 1 as soon as the distance must exceed it."""
+    if len(a) > len(b):
+        a, b = b, a
     m, n = len(a), len(b)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    for i in range(m + 1):
-        dp[i][0] = i
-    for j in range(n + 1):
-        dp[0][j] = j
+    if max_dist is not None and n - m > max_dist:
+        return max_dist + 1
+    if m == 0:
+        return n
+
+    peq = _PEQ
+    peq.clear()
+    bit = 1
+    for ch in a:
+        peq[ch] = peq.get(ch, 0) | bit
+        bit <<= 1
 
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if a[i - 1] != b[j - 1]:
-                dp[i][j] = min(
-                    dp[i - 1][j] + 1,  # deletion
-                    dp[i][j - 1] + 1,  # insertion
-                    dp[i - 1][j - 1] + 1  # replacement
-                )
-            else:
-                dp[i][j] = dp[i - 1][j - 1]
-    return dp[m][n]
+    mask = bit - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m  # vertical +1 / -1 deltas, D[m][0]
+    for j, ch in enumerate(b, 1):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        # D[m][n] >= D[m][j] - (n - j), so stop once that bound passes max_dist
+        if max_dist is not None and score - (n - j) > max_dist:
+            return max_dist + 1
+    return score
 
 def baseline_linear_search(dictionary, target, edit_distance=default_edit_distance, TOL=2):
+    if edit_distance is default_edit_distance:
+        # only whether a word is within TOL matters, so let it stop early
+        edit_distance = partial(default_edit_distance, max_dist=TOL)
     result = []
     for word in dictionary:
         if edit_distance(word, target) <= TOL:
@@ -4,6 +4,7 @@ try:
     import re
 
     import matplotlib.pyplot as plt
+    import numpy as np
     import pandas as pd
 
     from collections import defaultdict
@@ -14,6 +15,7 @@ try:
     from data_structures.Trie import Trie
     from data_structures import Array_BKTree
     from data_structures import Linked_BKTree
+    from data_structures import Columnar_BKTree
     from utils import *
 
     print("All libraries installed successfully.")